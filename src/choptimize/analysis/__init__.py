@@ -1,5 +1,10 @@
 """Analysis modules for choptimize."""
 
-from choptimize.analysis.analyzer import PromptAnalysisError, analyze_prompt
+from choptimize.analysis.analyzer import (
+    PromptAnalysisError,
+    analyze_prompt,
+    analyze_prompts,
+    stream_analysis,
+)
 
-__all__ = ["analyze_prompt", "PromptAnalysisError"]
+__all__ = ["analyze_prompt", "analyze_prompts", "stream_analysis", "PromptAnalysisError"]
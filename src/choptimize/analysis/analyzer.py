@@ -3,14 +3,110 @@
 This module coordinates the analysis of coding prompts.
 """
 
+import asyncio
+import dataclasses
+from collections.abc import Generator, Iterator, Sequence
+
+from pydantic import ValidationError
+
+from choptimize.analysis.cache import DiskCache, make_key
+from choptimize.analysis.criteria import AnalysisSchema
+from choptimize.analysis.heuristic import try_local_analyze
 from choptimize.api import gemini_client as client
-from choptimize.types import AnalysisResult
+from choptimize.types import DEFAULT_MODEL, FAST_MODEL, AnalysisResult, GeminiConfig
+
+_cache = DiskCache()
+
+# Prompts are analyzed by FAST_MODEL first & only re-analyzed by DEFAULT_MODEL
+# when its score lands in this band, where the cheap model is least reliable
+ESCALATION_BAND = (5.0, 8.0)
 
 
 class PromptAnalysisError(Exception):
     """Raised when there's an error analyzing a prompt"""
 
 
+def _create_config() -> GeminiConfig:
+    try:
+        return client.create_gemini_config()
+    except KeyError as e:
+        raise PromptAnalysisError(f"Configuration error: {e}") from e
+
+
+def _parse_response(response_text: str) -> AnalysisSchema:
+    # JSON decoding & validation in one pass, without an intermediate dict
+    try:
+        return AnalysisSchema.model_validate_json(response_text)
+    except ValidationError as e:
+        # str(e) includes `[type=...]` which would be read as Rich markup
+        details = "; ".join(
+            f"{'.'.join(map(str, error['loc'])) or 'response'}: {error['msg']}"
+            for error in e.errors()
+        )
+        raise PromptAnalysisError(
+            f"Received invalid analysis format from Gemini: {details}"
+        ) from e
+
+
+def _store(cache_key: str, analysis: AnalysisSchema) -> AnalysisResult:
+    # Only cache responses that parsed, so bad output is retried next time
+    _cache.set(cache_key, analysis.model_dump(exclude_none=True))
+    return analysis.to_result()
+
+
+def _check_coding_related(result: AnalysisResult) -> AnalysisResult:
+    if not result.is_coding_related:
+        raise PromptAnalysisError(
+            f"This prompt does not appear to be coding-related\n\n"
+            f"[bold yellow]Reason:[/bold yellow] {result.validation_reason}"
+        )
+    return result
+
+
+def _needs_escalation(result: AnalysisResult) -> bool:
+    # Rejections are escalated too: turning away a coding prompt is the
+    # costliest mistake the fast model can make
+    if not result.is_coding_related or result.overall_score is None:
+        return True
+    low, high = ESCALATION_BAND
+    return low <= result.overall_score <= high
+
+
+def _from_cache(user_prompt: str, model_name: str) -> AnalysisResult | None:
+    cached = _cache.get(make_key(user_prompt, model_name))
+    if cached is None:
+        return None
+    try:
+        analysis = AnalysisSchema.model_validate(cached)
+    except ValidationError:
+        return None  # Written by an incompatible version; re-analyze
+    return analysis.to_result()
+
+
+def _lookup(user_prompt: str) -> tuple[AnalysisResult | None, AnalysisResult | None]:
+    # (final result, cached fast result still awaiting escalation)
+    if (result := _from_cache(user_prompt, DEFAULT_MODEL)) is not None:
+        return result, None
+    fast = _from_cache(user_prompt, FAST_MODEL)
+    if fast is not None and not _needs_escalation(fast):
+        return fast, None
+    return None, fast
+
+
+def _fast_config(config: GeminiConfig) -> GeminiConfig:
+    # Same client (& connection pool); context caches are resolved per model
+    return dataclasses.replace(config, model_name=FAST_MODEL)
+
+
+def _analyze(config: GeminiConfig, user_prompt: str) -> AnalysisResult:
+    try:
+        response_text = client.analyze_prompt(config, user_prompt)
+    except client.GeminiClientError as e:
+        raise PromptAnalysisError(f"Error analyzing prompt: {e}") from e
+
+    return _store(make_key(user_prompt, config.model_name), _parse_response(response_text))
+
+
 def analyze_prompt(
     user_prompt: str,
 ) -> AnalysisResult:
@@ -18,7 +114,6 @@ def analyze_prompt(
 
     Args:
         user_prompt: Prompt to analyze
-        config: Optional Gemini configuration. If None, creates new config.
 
     Returns:
         AnalysisResult with complete analysis.
@@ -27,31 +122,183 @@ def analyze_prompt(
         PromptAnalysisError: If the prompt is not coding-related (and not skipped)
                            or if there's an error during analysis.
     """
-    try:
-        config = client.create_gemini_config()
-    except KeyError as e:
-        raise PromptAnalysisError(f"Configuration error: {e}") from e
+    # Trivially underspecified prompts don't need Gemini at all
+    if (local := try_local_analyze(user_prompt)) is not None:
+        return local
+
+    # Identical requests are served from disk without touching the API
+    result, fast = _lookup(user_prompt)
+    if result is None:
+        config = _create_config()
+
+        # Single API call per model that handles both validation and analysis
+        # The SYSTEM_INSTRUCTIONS already include validation logic
+        if fast is None:
+            fast = _analyze(_fast_config(config), user_prompt)
+        result = _analyze(config, user_prompt) if _needs_escalation(fast) else fast
+
+    return _check_coding_related(result)
+
 
-    # Single API call that handles both validation and analysis
-    # The SYSTEM_INSTRUCTIONS already include validation logic
+def _stream(
+    config: GeminiConfig, user_prompt: str
+) -> Generator[AnalysisResult, None, AnalysisResult]:
+    response_text = ""
     try:
-        analysis_dict = client.analyze_prompt(config, user_prompt)
+        for partial, response_text in client.stream_analysis(config, user_prompt):
+            if partial is not None and partial.get("is_coding_related") is True:
+                yield AnalysisResult.from_partial_dict(partial)
     except client.GeminiClientError as e:
         raise PromptAnalysisError(f"Error analyzing prompt: {e}") from e
 
-    # Convert to typed dataclass (validates structure automatically)
+    # The last response text streamed is the complete response
+    return _store(make_key(user_prompt, config.model_name), _parse_response(response_text))
+
+
+def _overlay(
+    base: AnalysisResult, partials: Generator[AnalysisResult, None, AnalysisResult]
+) -> Generator[AnalysisResult, None, AnalysisResult]:
+    # Fields that haven't arrived yet in each partial are taken from `base`
+    while True:
+        try:
+            partial = next(partials)
+        except StopIteration as stop:
+            return stop.value
+        yield dataclasses.replace(
+            base,
+            **{
+                f.name: value
+                for f in dataclasses.fields(partial)
+                if (value := getattr(partial, f.name)) is not None
+            },
+        )
+
+
+def stream_analysis(
+    user_prompt: str,
+    config: GeminiConfig | None = None,
+) -> Iterator[AnalysisResult]:
+    """Analyze a user's coding prompt, yielding results as they stream in
+
+    Partial results have None for fields that haven't arrived yet & are only
+    yielded once the prompt is known to be coding-related.
+
+    Args:
+        user_prompt: Prompt to analyze
+        config: Optional Gemini configuration. If None, creates new config
+            (only if the analysis isn't served locally or from cache).
+
+    Yields:
+        Partial AnalysisResults, followed by the complete analysis.
+
+    Raises:
+        PromptAnalysisError: If the prompt is not coding-related
+                           or if there's an error during analysis.
+    """
+    if (local := try_local_analyze(user_prompt)) is not None:
+        yield local
+        return
+
+    result, fast = _lookup(user_prompt)
+    if result is None:
+        if config is None:
+            config = _create_config()
+        if fast is None:
+            fast = yield from _stream(_fast_config(config), user_prompt)
+
+        if _needs_escalation(fast):
+            if fast.is_coding_related:
+                yield fast
+                # Keep the fast answer on screen, replacing it field by field
+                # as the escalated one streams in rather than blanking it
+                escalated = _stream(config, user_prompt)
+                result = yield from _overlay(fast, escalated)
+            else:
+                result = yield from _stream(config, user_prompt)
+        else:
+            result = fast
+
+    yield _check_coding_related(result)
+
+
+async def _a_analyze(config: GeminiConfig, user_prompt: str) -> AnalysisResult:
     try:
-        result = AnalysisResult.from_dict(analysis_dict)
-    except ValueError as e:
-        raise PromptAnalysisError(
-            f"Received invalid analysis format from Gemini: {e}"
-        ) from e
+        response_text = await client.a_analyze_prompt(config, user_prompt)
+    except client.GeminiClientError as e:
+        raise PromptAnalysisError(f"Error analyzing prompt: {e}") from e
 
-    # Check validation result (unless skipped)
-    if not result.is_coding_related:
-        raise PromptAnalysisError(
-            f"This prompt does not appear to be coding-related\n\n"
-            f"[bold yellow]Reason:[/bold yellow] {result.validation_reason}"
+    return _store(make_key(user_prompt, config.model_name), _parse_response(response_text))
+
+
+async def _a_analyze_uncached(
+    config: GeminiConfig,
+    fast_config: GeminiConfig,
+    user_prompt: str,
+    fast: AnalysisResult | None,
+    semaphore: asyncio.Semaphore,
+) -> AnalysisResult:
+    async with semaphore:
+        if fast is None:
+            fast = await _a_analyze(fast_config, user_prompt)
+        result = await _a_analyze(config, user_prompt) if _needs_escalation(fast) else fast
+
+    return _check_coding_related(result)
+
+
+async def analyze_prompts(
+    user_prompts: Sequence[str],
+    concurrency: int = 8,
+) -> list[AnalysisResult | PromptAnalysisError]:
+    """Analyze many coding prompts concurrently
+
+    Args:
+        user_prompts: Prompts to analyze
+        concurrency: Maximum number of in-flight Gemini requests
+
+    Returns:
+        Analysis (or the error raised analyzing it) for each prompt, in order.
+
+    Raises:
+        PromptAnalysisError: If there's a Gemini configuration error.
+    """
+    # Duplicates (e.g. from templated runs) are analyzed once & fanned out
+    unique_prompts = list(dict.fromkeys(user_prompts))
+    if len(unique_prompts) < len(user_prompts):
+        by_prompt = dict(zip(unique_prompts, await analyze_prompts(unique_prompts, concurrency)))
+        return [by_prompt[user_prompt] for user_prompt in user_prompts]
+
+    results: dict[int, AnalysisResult | PromptAnalysisError] = {}
+    pending: dict[int, AnalysisResult | None] = {}  # Prompt index -> cached fast result
+
+    for i, user_prompt in enumerate(user_prompts):
+        if (local := try_local_analyze(user_prompt)) is not None:
+            results[i] = local
+            continue
+
+        result, fast = _lookup(user_prompt)
+        if result is None:
+            pending[i] = fast
+            continue
+        try:
+            results[i] = _check_coding_related(result)
+        except PromptAnalysisError as e:
+            results[i] = e
+
+    if pending:
+        # One client (and connection pool) shared by every request
+        config = _create_config()
+        fast_config = _fast_config(config)
+        semaphore = asyncio.Semaphore(concurrency)
+        outcomes = await asyncio.gather(
+            *(
+                _a_analyze_uncached(config, fast_config, user_prompts[i], fast, semaphore)
+                for i, fast in pending.items()
+            ),
+            return_exceptions=True,
         )
+        for i, outcome in zip(pending, outcomes):
+            if not isinstance(outcome, AnalysisResult | PromptAnalysisError):
+                raise outcome
+            results[i] = outcome
 
-    return result
+    return [results[i] for i in range(len(user_prompts))]
@@ -0,0 +1,130 @@
+"""On-disk cache for prompt analyses.
+
+Analyses are keyed by a SHA-256 digest of everything that determines Gemini's
+response, so re-running the CLI on an unchanged prompt skips the API entirely.
+"""
+
+import contextlib
+import hashlib
+import json
+import os
+import threading
+import time
+from pathlib import Path
+from typing import Any
+
+from choptimize.analysis.criteria import SYSTEM_INSTRUCTIONS
+
+APP_DIR = Path.home() / ".choptimize"
+CACHE_DIR = APP_DIR / "cache"
+DEFAULT_TTL = 7 * 86400  # 1 week
+PRUNE_INTERVAL = 86400  # Seconds between sweeps for expired entries
+
+
+# Instructions are hashed once; keys extend a copy of this digest
+_KEY_PREFIX = hashlib.sha256(SYSTEM_INSTRUCTIONS.encode("utf-8") + b"\0")
+
+
+def make_key(user_prompt: str, model_name: str) -> str:
+    """Build cache key for an analysis request.
+
+    Args:
+        user_prompt: Prompt being analyzed
+        model_name: Gemini model used for the analysis
+
+    Returns:
+        Hex digest identifying the request.
+    """
+    digest = _KEY_PREFIX.copy()
+    digest.update(model_name.encode("utf-8") + b"\0")
+    digest.update(user_prompt.encode("utf-8"))
+    return digest.hexdigest()
+
+
+class DiskCache:
+    """File-per-entry JSON cache with expiry.
+
+    The cache is best-effort: unreadable or corrupt entries are treated as
+    misses & write failures are ignored, so it can never break an analysis.
+    """
+
+    def __init__(self, directory: Path = CACHE_DIR, ttl: int = DEFAULT_TTL) -> None:
+        self.directory = directory
+        self.ttl = ttl
+
+    def _path(self, key: str) -> Path:
+        return self.directory / f"{key}.json"
+
+    def _read(self, path: Path) -> dict[str, Any] | None:
+        # Entries are written atomically, so one that doesn't parse never will
+        try:
+            entry = json.loads(path.read_text(encoding="utf-8"))
+        except OSError:
+            return None
+        except ValueError:
+            entry = None
+
+        if not (
+            isinstance(entry, dict)
+            and isinstance(expires := entry.get("expires"), int | float)
+            and expires >= time.time()
+        ):
+            with contextlib.suppress(OSError):
+                path.unlink(missing_ok=True)
+            return None
+
+        return entry.get("value")
+
+    def _prune(self) -> None:
+        # Entries are otherwise only removed when read again, which a one-off
+        # prompt never is; a marker's mtime limits sweeps to one per interval
+        marker = self.directory / ".pruned"
+        now = time.time()
+        try:
+            if now - marker.stat().st_mtime < PRUNE_INTERVAL:
+                return
+        except FileNotFoundError:
+            pass
+        except OSError:
+            return
+
+        try:
+            marker.touch()
+            for path in self.directory.glob("*.json"):
+                self._read(path)
+            for path in self.directory.glob("*.tmp"):  # Left by killed writers
+                if path.stat().st_mtime < now - PRUNE_INTERVAL:
+                    path.unlink(missing_ok=True)
+        except OSError:
+            pass
+
+    def get(self, key: str) -> dict[str, Any] | None:
+        """Get cached value for a key.
+
+        Args:
+            key: Cache key (see ``make_key``)
+
+        Returns:
+            Cached value, or None if missing or expired.
+        """
+        return self._read(self._path(key))
+
+    def set(self, key: str, value: dict[str, Any]) -> None:
+        """Store value for a key, occasionally pruning expired entries.
+
+        Args:
+            key: Cache key (see ``make_key``)
+            value: JSON-serializable value to store
+        """
+        path = self._path(key)
+        tmp_path = path.with_suffix(f".{os.getpid()}.{threading.get_ident()}.tmp")
+        entry = {"expires": time.time() + self.ttl, "value": value}
+        try:
+            self.directory.mkdir(parents=True, exist_ok=True)
+            tmp_path.write_text(json.dumps(entry), encoding="utf-8")
+            tmp_path.replace(path)  # Atomic, so readers never see partial entries
+        except OSError:
+            tmp_path.unlink(missing_ok=True)
+            return
+
+        self._prune()
@@ -1,5 +1,11 @@
 """Prompt analysis criteria & system instructions"""
 
+from typing import Self
+
+from pydantic import BaseModel, model_validator
+
+from choptimize.types import METRIC_FIELDS, AnalysisResult, Metric
+
 SYSTEM_INSTRUCTIONS = """# Task: Analyze Coding Prompts
 
 Analyze coding-related prompts & provide detailed feedback on 5 quality metrics.
@@ -146,7 +152,7 @@ Return a JSON object with this exact structure:
 {
   "is_coding_related": true,
   "overall_score": <number 1-10, average of all metric scores>,
-  "overall_assessment": "<comprehensive 3-5 paragraph analysis that:
+  "overall_assessment": "<concise analysis (MAX 120 words) that:
     - Synthesizes insights across all 5 metrics holistically
     - Discusses how the metrics interact and affect overall prompt quality
     - Identifies patterns, strengths, and critical weaknesses
@@ -171,7 +177,7 @@ Return a JSON object with this exact structure:
     "brevity": {"score": <number 1-10>}
   },
   "recommendations": [
-    "<prioritized, actionable improvement considering all metrics
+    "<prioritized, actionable improvement considering all metrics (MAX 25 words)
      Use Rich markup for clarity:
      - [bold]Action verbs[/bold] at start of recommendations
      - [cyan]specific examples[/cyan] or [cyan]technical terms[/cyan]
@@ -179,15 +185,83 @@ Return a JSON object with this exact structure:
     >",
     ...
   ],
-  "improved_prompt": "<optional: rewritten prompt incorporating recommendations
+  "improved_prompt": "<only if overall_score < 7: rewritten prompt incorporating recommendations (MAX 150 words)
                       May use [bold] for important requirements or [cyan] for technical terms>"
 }
 ```
 
 #### Analysis Guidelines
-- Provide a comprehensive overall_assessment that synthesizes all metric insights
-- In recommendations, list 3-7 prioritized improvements that address multiple metrics
+- Provide a concise overall_assessment (MAX 120 words) that synthesizes all metric insights
+- In recommendations, list 3-5 prioritized improvements (MAX 5 items, MAX 25 words each) that address multiple metrics
 - Focus on high-impact changes that improve overall prompt quality
 - Be specific and actionable, referencing concrete examples from the prompt
 - Include improved_prompt if overall_score < 7
+- DO NOT include improved_prompt if overall_score >= 7
 """
+
+
+class MetricSchema(BaseModel):
+    """Structured output schema for a single metric."""
+
+    score: float
+
+
+class MetricsSchema(BaseModel):
+    """Structured output schema for the 5 quality metrics (``METRIC_FIELDS``)."""
+
+    specificity: MetricSchema
+    clarity: MetricSchema
+    context: MetricSchema
+    constraints: MetricSchema
+    brevity: MetricSchema
+
+
+class AnalysisSchema(BaseModel):
+    """Structured output schema matching the format in ``SYSTEM_INSTRUCTIONS``.
+
+    Field order is preserved in the schema, so ``is_coding_related`` streams first.
+    """
+
+    is_coding_related: bool
+    reason: str | None = None
+    overall_score: float | None = None
+    overall_assessment: str | None = None
+    metrics: MetricsSchema | None = None
+    recommendations: list[str] | None = None
+    improved_prompt: str | None = None
+
+    @model_validator(mode="after")
+    def _check_complete(self) -> Self:
+        # Fields are optional so non-coding responses can omit them, but a
+        # full analysis needs them all
+        if self.is_coding_related:
+            for field in ("overall_score", "overall_assessment", "metrics"):
+                if getattr(self, field) is None:
+                    raise ValueError(f"{field} is required for coding-related prompts")
+        return self
+
+    def to_result(self) -> AnalysisResult:
+        """Convert to the AnalysisResult used by the rest of the app.
+
+        Returns:
+            AnalysisResult instance.
+        """
+        if not self.is_coding_related or self.metrics is None:
+            return AnalysisResult(
+                is_coding_related=False,
+                validation_reason=self.reason or "Not a coding prompt",
+            )
+
+        metrics = self.metrics
+        return AnalysisResult(
+            is_coding_related=True,
+            overall_score=self.overall_score,
+            overall_assessment=self.overall_assessment,
+            **{
+                name: Metric(score=getattr(metrics, name).score)
+                for name in METRIC_FIELDS
+            },
+            recommendations=list(self.recommendations or []),
+            improved_prompt=self.improved_prompt,
+        )
+
@@ -0,0 +1,72 @@
+"""Local heuristic analysis for trivially underspecified prompts.
+
+Prompts like "fix bug" can be scored low on every metric with certainty, so
+they're answered locally instead of paying for a Gemini round-trip.
+"""
+
+import re
+
+from rich.markup import escape
+
+from choptimize.types import AnalysisResult, Metric
+
+MIN_WORDS = 4
+
+# Unambiguous code signals only: inline code, a call, a source file name or a
+# language/tool name with no everyday meaning. Words like "fix", "class" or
+# "program" are just as common outside coding, so those prompts go to Gemini.
+_CODE_SIGNALS = re.compile(
+    r"`"
+    r"|\w\(\)"
+    r"|\w\.(?:py|pyi|js|jsx|ts|tsx|rs|go|java|kt|c|cc|cpp|h|hpp|cs|rb|php|sh|sql"
+    r"|html|css|json|ya?ml|toml)\b"
+    r"|(?<![\w+#])(?:python3?|javascript|typescript|golang|kotlin|c\+\+|c#|sql|html|css"
+    r"|regex|npm|pytest|numpy|django|docker|kubernetes)(?![\w+#])",
+    re.IGNORECASE,
+)
+
+_ASSESSMENT = (
+    "This prompt is [red]too short to act on[/red]. It names a task but gives no "
+    "[cyan]language[/cyan], [cyan]codebase context[/cyan], [cyan]inputs/outputs[/cyan] "
+    "or [cyan]constraints[/cyan], so any answer has to guess at nearly every "
+    "requirement. Its [italic]brevity[/italic] comes at the cost of the detail a "
+    "useful response needs."
+)
+
+_RECOMMENDATIONS = [
+    "[bold]State[/bold] the [cyan]language[/cyan], [cyan]framework[/cyan] and versions involved",
+    "[bold]Describe[/bold] the expected behaviour with [cyan]input/output examples[/cyan]",
+    "[bold]Include[/bold] relevant code, error messages or stack traces",
+    "[bold]List[/bold] constraints such as performance, compatibility or style requirements",
+]
+
+
+def try_local_analyze(prompt: str) -> AnalysisResult | None:
+    """Analyze prompt locally if it's certain to score poorly.
+
+    Args:
+        prompt: Prompt to analyze
+
+    Returns:
+        AnalysisResult, or None if the prompt needs a full Gemini analysis.
+    """
+    if len(prompt.split()) >= MIN_WORDS or not _CODE_SIGNALS.search(prompt):
+        return None
+
+    return AnalysisResult(
+        is_coding_related=True,
+        overall_score=1.6,  # Average of the metric scores below
+        overall_assessment=_ASSESSMENT,
+        specificity=Metric(score=1.0),
+        clarity=Metric(score=3.0),
+        context=Metric(score=1.0),
+        constraints=Metric(score=1.0),
+        brevity=Metric(score=2.0),
+        recommendations=list(_RECOMMENDATIONS),
+        improved_prompt=(
+            f"{escape(prompt)} in [cyan]<language/framework + version>[/cyan].\n"
+            "Context: [cyan]<relevant code, error message or stack trace>[/cyan]\n"
+            "Expected behaviour: [cyan]<example input -> expected output>[/cyan]\n"
+            "Constraints: [cyan]<performance, compatibility or style requirements>[/cyan]"
+        ),
+    )
@@ -2,12 +2,16 @@
 
 from choptimize.api.gemini_client import (
     GeminiClientError,
+    a_analyze_prompt,
     analyze_prompt,
     create_gemini_config,
+    stream_analysis,
 )
 
 __all__ = [
     "GeminiClientError",
     "create_gemini_config",
     "analyze_prompt",
+    "a_analyze_prompt",
+    "stream_analysis",
 ]
@@ -3,75 +3,84 @@
 This module handles all interactions with the Google Gemini API.
 """
 
+import asyncio
+import functools
+import hashlib
 import json
 import os
+import time
+from collections.abc import Iterator
 from pathlib import Path
 from typing import Any
 
-from dotenv import load_dotenv
 from google import genai
-from google.genai import types
+from google.genai import errors, types
 
-from choptimize.analysis.criteria import SYSTEM_INSTRUCTIONS
+from choptimize.analysis.cache import APP_DIR
+from choptimize.analysis.criteria import SYSTEM_INSTRUCTIONS, AnalysisSchema
+from choptimize.api.partial_json import parse_partial_json
 from choptimize.types import GeminiConfig
 
+CONTEXT_CACHE_PATH = APP_DIR / "gemini_cache.json"
+CONTEXT_CACHE_TTL = 3600  # Seconds
+_CONTEXT_CACHE_MARGIN = 60  # Don't hand out handles about to expire
+_CONTEXT_CACHE_RETRY = 900  # Seconds before retrying a model whose cache create failed
+_INSTRUCTIONS_DIGEST = hashlib.sha256(SYSTEM_INSTRUCTIONS.encode("utf-8")).hexdigest()
+
 
 class GeminiClientError(Exception):
     """Raised when there's an error communicating with Gemini API."""
 
 
-def _parse_json_response(response_text: str) -> dict[str, Any]:
-    """Parse JSON response from Gemini.
-
-    Args:
-        response_text: The response text from Gemini.
-
-    Returns:
-        Parsed JSON dictionary.
-
-    Raises:
-        GeminiClientError: If JSON parsing fails.
-    """
-    try:
-        return json.loads(response_text)
-    except json.JSONDecodeError as e:
-        raise GeminiClientError(
-            f"Failed to parse Gemini response as JSON: {e}\nResponse: {response_text}"
-        ) from e
-
-
-def _get_generation_config(system_instruction: str) -> types.GenerateContentConfig:
+@functools.cache
+def _get_generation_config(
+    cache_name: str | None = None,
+) -> types.GenerateContentConfig:
     """Create generation config with system instruction.
 
+    Every field is fixed apart from the cache handle, so configs are built
+    once per handle & shared between requests.
+
     Args:
-        system_instruction: System instruction to include in config.
+        cache_name: Explicit context cache holding the system instructions.
+            If None, the instructions are sent inline.
 
     Returns:
         GenerateContentConfig with all parameters configured.
     """
     return types.GenerateContentConfig(
-        system_instruction=system_instruction,
+        system_instruction=None if cache_name else SYSTEM_INSTRUCTIONS,
+        cached_content=cache_name,
         temperature=0.3,  # Lower temperature for more consistent analysis
         top_p=0.95,
         top_k=40,
-        max_output_tokens=8192,
+        max_output_tokens=1024,  # Output is capped in SYSTEM_INSTRUCTIONS; decode is per-token serial
         response_mime_type="application/json",
+        response_schema=AnalysisSchema,  # Structured decoding
+        # No hidden reasoning: the analysis is a single structured pass
+        thinking_config=types.ThinkingConfig(thinking_budget=0),
     )
 
 
+@functools.cache
 def _get_api_key() -> str:
     """Load API key from environment variables.
 
+    Falls back to the ``.env`` file in the working directory, which is only
+    read if the key isn't already exported (and at most once per process).
+
     Returns:
         The Gemini API key.
 
     Raises:
         KeyError: If API key not found in environment.
     """
-    env_path = Path.cwd() / ".env"
-    load_dotenv(env_path)
+    api_key = os.environ.get("GEMINI_API_KEY")
+    if api_key is None:
+        from dotenv import dotenv_values
+
+        api_key = dotenv_values(Path.cwd() / ".env").get("GEMINI_API_KEY")
 
-    api_key = os.getenv("GEMINI_API_KEY")
     if api_key is None:
         raise KeyError(
             "GEMINI_API_KEY not found in environment variables\n"
@@ -81,9 +90,160 @@ def _get_api_key() -> str:
     return api_key
 
 
+def _load_context_caches() -> dict[str, Any]:
+    """Load persisted context cache handles (keyed by model name)."""
+    try:
+        entries = json.loads(CONTEXT_CACHE_PATH.read_text(encoding="utf-8"))
+    except (OSError, ValueError):
+        return {}
+    return entries if isinstance(entries, dict) else {}
+
+
+def _save_context_caches(entries: dict[str, Any]) -> None:
+    """Persist context cache handles, ignoring filesystem errors."""
+    try:
+        CONTEXT_CACHE_PATH.parent.mkdir(parents=True, exist_ok=True)
+        CONTEXT_CACHE_PATH.write_text(json.dumps(entries), encoding="utf-8")
+    except OSError:
+        pass
+
+
+def _forget_context_cache(model_name: str) -> None:
+    """Drop persisted handle for a model so the next config re-creates it."""
+    entries = _load_context_caches()
+    if entries.pop(model_name, None) is not None:
+        _save_context_caches(entries)
+
+
+def _persisted_context_cache(model_name: str) -> tuple[bool, str | None]:
+    """Look up persisted context cache handle for a model.
+
+    Returns:
+        Whether a live entry (possibly a failed create) was found, & its
+        cache name.
+    """
+    entry = _load_context_caches().get(model_name)
+    if (
+        isinstance(entry, dict)
+        and entry.get("digest") == _INSTRUCTIONS_DIGEST
+        and isinstance(expires := entry.get("expires"), int | float)
+        and expires > time.time() + _CONTEXT_CACHE_MARGIN
+    ):
+        return True, entry.get("name")
+    return False, None
+
+
+def _persist_context_cache(
+    model_name: str, cache: types.CachedContent | None
+) -> str | None:
+    """Persist outcome of a context cache create (None if it failed).
+
+    Returns:
+        Cache name, or None if the create failed.
+    """
+    if cache is None:
+        name = None
+        expires = time.time() + _CONTEXT_CACHE_RETRY
+    else:
+        name = cache.name
+        expires = (
+            cache.expire_time.timestamp()
+            if cache.expire_time
+            else time.time() + CONTEXT_CACHE_TTL
+        )
+
+    # Re-read, as other models' entries may have changed since the lookup
+    entries = _load_context_caches()
+    entries[model_name] = {
+        "name": name,
+        "expires": expires,
+        "digest": _INSTRUCTIONS_DIGEST,
+    }
+    _save_context_caches(entries)
+    return name
+
+
+_CREATE_CACHE_CONFIG = types.CreateCachedContentConfig(
+    system_instruction=SYSTEM_INSTRUCTIONS,
+    ttl=f"{CONTEXT_CACHE_TTL}s",
+)
+
+
+def _get_context_cache(client: genai.Client, model_name: str) -> str | None:
+    """Get (or create) explicit context cache holding ``SYSTEM_INSTRUCTIONS``.
+
+    Handles are persisted so repeated CLI invocations within the TTL reuse
+    the same server-side cache instead of re-sending the instructions. So
+    are failed creates, so models/tiers without caching aren't retried (a
+    blocking round-trip) on every invocation.
+
+    Args:
+        client: Gemini API client.
+        model_name: Model the cache is created for.
+
+    Returns:
+        Cache name, or None if context caching is unavailable.
+    """
+    found, name = _persisted_context_cache(model_name)
+    if found:
+        return name
+
+    try:
+        cache = client.caches.create(model=model_name, config=_CREATE_CACHE_CONFIG)
+    except Exception:
+        # Not every tier/model supports explicit caching; send instructions inline
+        cache = None
+    return _persist_context_cache(model_name, cache)
+
+
+# In-flight async creates, shared by concurrent requests for the same model
+_a_context_cache_creates: dict[
+    tuple[asyncio.AbstractEventLoop, str], asyncio.Task[str | None]
+] = {}
+
+
+async def _a_create_context_cache(client: genai.Client, model_name: str) -> str | None:
+    try:
+        cache = await client.aio.caches.create(
+            model=model_name, config=_CREATE_CACHE_CONFIG
+        )
+    except Exception:
+        cache = None
+    return _persist_context_cache(model_name, cache)
+
+
+async def _a_get_context_cache(client: genai.Client, model_name: str) -> str | None:
+    """Async ``_get_context_cache``, which doesn't block the event loop.
+
+    Concurrent calls for the same model share one create, so a batch's
+    first wave of requests doesn't create a cache per request.
+
+    Args:
+        client: Gemini API client.
+        model_name: Model the cache is created for.
+
+    Returns:
+        Cache name, or None if context caching is unavailable.
+    """
+    found, name = _persisted_context_cache(model_name)
+    if found:
+        return name
+
+    key = (asyncio.get_running_loop(), model_name)
+    if (task := _a_context_cache_creates.get(key)) is None:
+        task = asyncio.ensure_future(_a_create_context_cache(client, model_name))
+        _a_context_cache_creates[key] = task
+        task.add_done_callback(lambda _: _a_context_cache_creates.pop(key, None))
+    # Shielded so one cancelled request doesn't cancel the create for the rest
+    return await asyncio.shield(task)
+
+
 def create_gemini_config() -> GeminiConfig:
     """Create Gemini configuration with API key from environment.
 
+    Context caches are per model, so they're looked up (or created) when a
+    request is made rather than here; see ``_get_context_cache``.
+
     Returns:
         GeminiConfig with initialized client.
 
@@ -95,7 +255,108 @@ def create_gemini_config() -> GeminiConfig:
     return GeminiConfig(client=client)
 
 
-def analyze_prompt(config: GeminiConfig, prompt_text: str) -> dict[str, Any]:
+def _is_stale_cache_error(cache_name: str | None, error: errors.ClientError) -> bool:
+    """Check if an API error was caused by an expired/deleted context cache."""
+    return cache_name is not None and error.code in (403, 404)
+
+
+def _generate_content(
+    config: GeminiConfig, prompt_text: str
+) -> types.GenerateContentResponse:
+    """Call Gemini, retrying inline if the context cache has gone away.
+
+    Args:
+        config: Gemini configuration.
+        prompt_text: Prompt to send to Gemini.
+
+    Returns:
+        Raw Gemini response.
+    """
+    cache_name = _get_context_cache(config.client, config.model_name)
+    try:
+        return config.client.models.generate_content(
+            model=config.model_name,
+            contents=prompt_text,
+            config=_get_generation_config(cache_name),
+        )
+    except errors.ClientError as e:
+        if not _is_stale_cache_error(cache_name, e):
+            raise
+        _forget_context_cache(config.model_name)
+        return config.client.models.generate_content(
+            model=config.model_name,
+            contents=prompt_text,
+            config=_get_generation_config(),
+        )
+
+
+def _stream_content(
+    config: GeminiConfig, prompt_text: str
+) -> Iterator[types.GenerateContentResponse]:
+    """Stream Gemini response, retrying inline if the context cache has gone away.
+
+    Args:
+        config: Gemini configuration.
+        prompt_text: Prompt to send to Gemini.
+
+    Yields:
+        Raw Gemini response chunks.
+    """
+    cache_name = _get_context_cache(config.client, config.model_name)
+    try:
+        stream = config.client.models.generate_content_stream(
+            model=config.model_name,
+            contents=prompt_text,
+            config=_get_generation_config(cache_name),
+        )
+        first = next(stream, None)
+    except errors.ClientError as e:
+        if not _is_stale_cache_error(cache_name, e):
+            raise
+        _forget_context_cache(config.model_name)
+        stream = config.client.models.generate_content_stream(
+            model=config.model_name,
+            contents=prompt_text,
+            config=_get_generation_config(),
+        )
+        first = next(stream, None)
+
+    if first is not None:
+        yield first
+        yield from stream
+
+
+async def _a_generate_content(
+    config: GeminiConfig, prompt_text: str
+) -> types.GenerateContentResponse:
+    """Async ``_generate_content``.
+
+    Args:
+        config: Gemini configuration.
+        prompt_text: Prompt to send to Gemini.
+
+    Returns:
+        Raw Gemini response.
+    """
+    cache_name = await _a_get_context_cache(config.client, config.model_name)
+    try:
+        return await config.client.aio.models.generate_content(
+            model=config.model_name,
+            contents=prompt_text,
+            config=_get_generation_config(cache_name),
+        )
+    except errors.ClientError as e:
+        if not _is_stale_cache_error(cache_name, e):
+            raise
+        _forget_context_cache(config.model_name)
+        return await config.client.aio.models.generate_content(
+            model=config.model_name,
+            contents=prompt_text,
+            config=_get_generation_config(),
+        )
+
+
+def analyze_prompt(config: GeminiConfig, prompt_text: str) -> str:
     """Analyze coding prompt with Gemini.
 
     Args:
@@ -103,21 +364,70 @@ def analyze_prompt(config: GeminiConfig, prompt_text: str) -> dict[str, Any]:
         prompt_text: Prompt to send to Gemini for analysis.
 
     Returns:
-        A dictionary containing analysis results.
+        JSON response text (see ``AnalysisSchema``).
 
     Raises:
         GeminiClientError: If error communicating with API.
     """
 
     try:
-        gen_config = _get_generation_config(SYSTEM_INSTRUCTIONS)
-        response = config.client.models.generate_content(
-            model=config.model_name,
-            contents=prompt_text,
-            config=gen_config,
-        )
+        response = _generate_content(config, prompt_text)
+        if response.text is None:
+            raise Exception("No response from Gemini API")
+        return response.text
+    except Exception as e:
+        raise GeminiClientError(f"Error calling Gemini API: {e}") from e
+
+
+async def a_analyze_prompt(config: GeminiConfig, prompt_text: str) -> str:
+    """Analyze coding prompt with Gemini (async).
+
+    Args:
+        config: Gemini configuration.
+        prompt_text: Prompt to send to Gemini for analysis.
+
+    Returns:
+        JSON response text (see ``AnalysisSchema``).
+
+    Raises:
+        GeminiClientError: If error communicating with API.
+    """
+
+    try:
+        response = await _a_generate_content(config, prompt_text)
         if response.text is None:
             raise Exception("No response from Gemini API")
-        return _parse_json_response(response.text)
+        return response.text
+    except Exception as e:
+        raise GeminiClientError(f"Error calling Gemini API: {e}") from e
+
+
+def stream_analysis(
+    config: GeminiConfig, prompt_text: str
+) -> Iterator[tuple[dict[str, Any] | None, str]]:
+    """Analyze coding prompt with Gemini, streaming the response.
+
+    Args:
+        config: Gemini configuration.
+        prompt_text: Prompt to send to Gemini for analysis.
+
+    Yields:
+        Partial analysis dictionary (None if nothing usable has arrived yet) &
+        JSON response text so far, for each chunk received. The last response
+        text is complete (see ``AnalysisSchema``).
+
+    Raises:
+        GeminiClientError: If error communicating with API.
+    """
+    response_text = ""
+    try:
+        for chunk in _stream_content(config, prompt_text):
+            if not chunk.text:
+                continue
+            response_text += chunk.text
+            yield parse_partial_json(response_text), response_text
     except Exception as e:
         raise GeminiClientError(f"Error calling Gemini API: {e}") from e
+
+    if not response_text:
+        raise GeminiClientError("Error calling Gemini API: No response from Gemini API")
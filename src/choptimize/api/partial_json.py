@@ -0,0 +1,80 @@
+"""Incremental parsing of streamed JSON responses.
+
+Gemini streams its JSON response in arbitrary chunks; this module turns an
+incomplete prefix into the most complete JSON object it can represent.
+"""
+
+import json
+from typing import Any
+
+try:
+    from orjson import loads as json_loads
+except ImportError:  # Optional speedup (`choptimize[fast]`)
+    from json import loads as json_loads
+
+
+def _try_loads(text: str) -> Any:
+    try:
+        return json_loads(text)
+    except json.JSONDecodeError:
+        return None
+
+
+def parse_partial_json(text: str) -> dict[str, Any] | None:
+    """Parse the longest usable prefix of a streamed JSON object.
+
+    Open containers are closed & an unterminated string value is terminated,
+    so long strings appear as they arrive. Incomplete keys, numbers and
+    literals are dropped until they finish streaming.
+
+    Args:
+        text: JSON text received so far
+
+    Returns:
+        Parsed object, or None if nothing usable has arrived yet.
+    """
+    closers: list[str] = []
+    in_string = escaped = is_key = expect_key = False
+    cut, cut_closers = 0, ""  # Last position where the prefix is a complete value
+
+    for i, char in enumerate(text):
+        if in_string:
+            if escaped:
+                escaped = False
+            elif char == "\\":
+                escaped = True
+            elif char == '"':
+                in_string = False
+                if not is_key:
+                    cut, cut_closers = i + 1, "".join(reversed(closers))
+            continue
+
+        if char == '"':
+            in_string, is_key = True, expect_key
+        elif char in "{[":
+            closers.append("}" if char == "{" else "]")
+            expect_key = char == "{"
+            cut, cut_closers = i + 1, "".join(reversed(closers))
+        elif char in "}]":
+            if closers:
+                closers.pop()
+            expect_key = False
+            cut, cut_closers = i + 1, "".join(reversed(closers))
+        elif char == ",":
+            cut, cut_closers = i, "".join(reversed(closers))
+            expect_key = bool(closers) and closers[-1] == "}"
+        elif char == ":":
+            expect_key = False
+
+    parsed = None
+    if in_string and not is_key:
+        # Terminate the string value that's still streaming, dropping any
+        # escape sequence that's only partially arrived
+        closing = '"' + "".join(reversed(closers))
+        parsed = _try_loads(text + closing)
+        if parsed is None:
+            parsed = _try_loads(text[: text.rfind("\\")] + closing)
+    if parsed is None:
+        parsed = _try_loads(text[:cut] + cut_closers)
+
+    return parsed if isinstance(parsed, dict) else None
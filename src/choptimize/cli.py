@@ -1,24 +1,53 @@
+import argparse
+import asyncio
+import functools
+import itertools
 import sys
-
-from rich_argparse import RichHelpFormatter
-
-from choptimize.analysis import PromptAnalysisError, analyze_prompt
-from choptimize.display import ArgParser, cout, display_analysis, echo_err
-
-RichHelpFormatter.styles = {
-    "argparse.args": "cyan",
-    "argparse.groups": "bold green",
-    "argparse.prog": "cyan",
-    "argparse.metavar": "cyan",
-    "argparse.help": "default",
-    "argparse.text": "default",
-}
+from typing import TYPE_CHECKING
+
+from choptimize.display import (
+    ArgParser,
+    cout,
+    display_analysis,
+    display_batch_results,
+    echo,
+    echo_err,
+)
+
+if TYPE_CHECKING:
+    from rich_argparse import RichHelpFormatter
+
+
+@functools.cache
+def _init_formatter() -> type["RichHelpFormatter"]:
+    # Only needed once a parser is built, which `choptimize "<prompt>"` skips
+    from rich_argparse import RichHelpFormatter
+
+    RichHelpFormatter.styles = {
+        "argparse.args": "cyan",
+        "argparse.groups": "bold green",
+        "argparse.prog": "cyan",
+        "argparse.metavar": "cyan",
+        "argparse.help": "default",
+        "argparse.text": "default",
+    }
+    return RichHelpFormatter
+
+
+def _positive_int(value: str) -> int:
+    try:
+        number = int(value)
+    except ValueError:
+        number = 0
+    if number < 1:
+        raise argparse.ArgumentTypeError(f"expected a positive integer, got {value!r}")
+    return number
 
 
 def make_arg_parser() -> ArgParser:
     parser = ArgParser(
         description="Analyze & optimize coding prompts",
-        formatter_class=RichHelpFormatter,
+        formatter_class=_init_formatter(),
         add_help=False,
     )
     parser.add_argument(
@@ -39,6 +68,25 @@ def make_arg_parser() -> ArgParser:
         nargs="?",
         help="Prompt to analyze",
     )
+    parser.add_argument(
+        "-b",
+        "--batch",
+        action="store_true",
+        help="Analyze prompts from stdin (one per line, or NUL-delimited) & output JSON Lines",
+    )
+    parser.add_argument(
+        "--daemon",
+        action="store_true",
+        help="Run a server that keeps a warm Gemini client for later runs to reuse",
+    )
+    parser.add_argument(
+        "-j",
+        "--concurrency",
+        type=_positive_int,
+        default=8,
+        metavar="N",
+        help="Maximum concurrent requests in batch mode (default: %(default)s)",
+    )
 
     return parser
 
@@ -70,6 +118,83 @@ def get_prompt_input(prompt: str | None) -> str:
     return prompt
 
 
+def get_batch_input() -> list[str]:
+    """Get prompts to analyze in batch mode (from stdin)
+
+    Prompts are newline-delimited, or NUL-delimited if the input contains any
+    NUL characters (allows multi-line prompts).
+
+    Returns:
+        Prompt texts to analyze
+    """
+    if sys.stdin.isatty():
+        echo_err(
+            "no prompts provided",
+            "provide via pipe [cyan]|[/cyan] or redirect [cyan]<[/cyan]",
+        )
+        sys.exit(1)
+
+    data = sys.stdin.read()
+    prompts = [prompt.strip() for prompt in data.split("\0" if "\0" in data else "\n")]
+    prompts = [prompt for prompt in prompts if prompt]
+
+    if not prompts:
+        echo_err("empty batch provided")
+        sys.exit(1)
+
+    return prompts
+
+
+def _analyze_single(prompt_text: str) -> None:
+    from choptimize import daemon
+
+    # Prefer a running daemon's warm client over setting one up here
+    if (sock := daemon.connect()) is not None:
+        analyses = daemon.request_analysis(sock, prompt_text)
+        errors: tuple[type[Exception], ...] = (daemon.DaemonError,)
+    else:
+        # Deferred so `--help`/`--version` & input errors never import google.genai
+        from choptimize.analysis import PromptAnalysisError, stream_analysis
+
+        analyses = stream_analysis(prompt_text)
+        errors = (PromptAnalysisError,)
+
+    try:
+        # Spin until the first (partial) result arrives, then render live
+        with cout.status("[green]Analyzing prompt [/green]", spinner="bouncingBar"):
+            first = next(analyses)
+
+        display_analysis(itertools.chain([first], analyses), prompt_text)
+    except errors as e:
+        echo_err("error analyzing prompt", str(e), then_exit_with=1)
+
+
+def _run_daemon() -> None:
+    from choptimize import daemon
+
+    try:
+        server = daemon.create_server()
+    except (KeyError, RuntimeError) as e:
+        echo_err("error starting daemon", str(e), then_exit_with=1)
+        return  # Unreachable; echo_err exits, but isn't typed to say so
+
+    echo(f"[green]Serving[/green] on [cyan]{server.server_address}[/cyan] (Ctrl+C to stop)")
+    daemon.serve(server)
+
+
+def _analyze_batch(prompts: list[str], concurrency: int) -> None:
+    from choptimize.analysis import PromptAnalysisError, analyze_prompts
+
+    try:
+        with cout.status("[green]Analyzing prompts [/green]", spinner="bouncingBar"):
+            results = asyncio.run(analyze_prompts(prompts, concurrency))
+    except PromptAnalysisError as e:
+        echo_err("error analyzing prompts", str(e), then_exit_with=1)
+        return  # Unreachable; echo_err exits, but isn't typed to say so
+
+    display_batch_results(prompts, results)
+
+
 def run() -> None:
     """Analyze & optimize coding prompts.
 
@@ -85,22 +210,31 @@ def run() -> None:
       choptimize "Write a function to reverse a string"
       echo "Create a REST API" | choptimize
       choptimize < my_prompt.txt
+      choptimize --batch < prompts.txt > results.jsonl
+      choptimize --daemon &
     """
 
     try:
+        # Fast path for the common `choptimize "<prompt>"` shape: no options,
+        # so there's nothing for the full parser to do
+        if len(sys.argv) == 2 and not sys.argv[1].startswith("-"):
+            _analyze_single(get_prompt_input(sys.argv[1]))
+            return
+
         parser = make_arg_parser()
         args = parser.parse_args()
 
-        prompt: str = args.prompt
-        prompt_text = get_prompt_input(prompt)
+        if args.daemon:
+            _run_daemon()
+        elif args.batch:
+            if args.prompt is not None:
+                parser.error("prompt argument not allowed with [cyan]--batch[/cyan]")
 
-        with cout.status("[green]Analyzing prompt [/green]", spinner="bouncingBar"):
-            analysis = analyze_prompt(prompt_text)
-
-        display_analysis(analysis, prompt_text)
+            _analyze_batch(get_batch_input(), args.concurrency)
+        else:
+            prompt: str = args.prompt
+            _analyze_single(get_prompt_input(prompt))
 
-    except PromptAnalysisError as e:
-        echo_err("error analyzing prompt", str(e), then_exit_with=1)
     except Exception as e:
         echo_err("unexpected error", str(e), then_exit_with=1)
     except KeyboardInterrupt:
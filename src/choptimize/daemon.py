@@ -0,0 +1,196 @@
+"""Persistent analysis server for choptimize.
+
+``choptimize --daemon`` keeps one warm Gemini client (connection pool, TLS
+session & auth) alive behind a Unix domain socket. Later CLI runs connect to
+it instead of paying that setup on every invocation.
+
+Protocol: the client sends one JSON line ``{"prompt": ...}``; the server
+replies with JSON lines, each ``{"analysis": ...}`` (in the Gemini response
+format), the last marked ``"final": true``, or an ``{"error": ...}``.
+"""
+
+import json
+import os
+import socket
+import socketserver
+import stat
+import tempfile
+from collections.abc import Iterator
+from pathlib import Path
+from typing import TYPE_CHECKING, Any
+
+from choptimize.types import AnalysisResult
+
+if TYPE_CHECKING:
+    from choptimize.types import GeminiConfig
+
+CONNECT_TIMEOUT = 0.5  # Seconds
+RESPONSE_TIMEOUT = 120  # Seconds
+
+
+def get_socket_path() -> Path:
+    """Get path of the daemon's Unix domain socket.
+
+    Returns:
+        ``$XDG_RUNTIME_DIR/choptimize.sock``, or a socket in a per-user
+        directory under the temp directory if ``XDG_RUNTIME_DIR`` isn't set.
+    """
+    runtime_dir = os.environ.get("XDG_RUNTIME_DIR")
+    if runtime_dir:
+        return Path(runtime_dir) / "choptimize.sock"
+    return Path(tempfile.gettempdir()) / f"choptimize-{os.getuid()}" / "daemon.sock"
+
+
+def _is_private(path: Path) -> bool:
+    """Check path is owned by this user & inaccessible to anyone else."""
+    try:
+        st = path.lstat()
+    except OSError:
+        return False
+    return st.st_uid == os.getuid() and not stat.S_IMODE(st.st_mode) & 0o077
+
+
+class DaemonError(Exception):
+    """Raised when the daemon reports an error analyzing a prompt"""
+
+
+def connect() -> socket.socket | None:
+    """Connect to running daemon, if any.
+
+    Sockets (or directories) another user could have planted are ignored, so
+    prompts are never sent to a server this user didn't start.
+
+    Returns:
+        Connected socket, or None if no daemon is listening.
+    """
+    path = get_socket_path()
+    if not (_is_private(path.parent) and _is_private(path)):
+        return None
+
+    sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+    sock.settimeout(CONNECT_TIMEOUT)
+    try:
+        sock.connect(str(path))
+    except OSError:
+        sock.close()
+        return None
+    sock.settimeout(RESPONSE_TIMEOUT)
+    return sock
+
+
+def request_analysis(sock: socket.socket, user_prompt: str) -> Iterator[AnalysisResult]:
+    """Analyze prompt via the daemon, yielding results as they stream in.
+
+    Args:
+        sock: Socket connected to the daemon (see ``connect``); closed when done
+        user_prompt: Prompt to analyze
+
+    Yields:
+        Partial AnalysisResults, followed by the complete analysis.
+
+    Raises:
+        DaemonError: If the daemon fails to analyze the prompt.
+    """
+    with sock, sock.makefile("rwb") as stream:
+        stream.write(json.dumps({"prompt": user_prompt}).encode() + b"\n")
+        stream.flush()
+
+        for line in stream:
+            message = json.loads(line)
+            if "error" in message:
+                raise DaemonError(message["error"])
+            yield AnalysisResult.from_partial_dict(message["analysis"])
+            if message.get("final") is True:
+                return
+
+        raise DaemonError("daemon closed connection before the analysis was complete")
+
+
+class _AnalysisHandler(socketserver.StreamRequestHandler):
+    server: "_AnalysisServer"
+
+    def _send(self, message: dict[str, Any]) -> None:
+        self.wfile.write(json.dumps(message).encode() + b"\n")
+        self.wfile.flush()
+
+    def handle(self) -> None:
+        from choptimize.analysis import PromptAnalysisError, stream_analysis
+
+        try:
+            request = json.loads(self.rfile.readline())
+            user_prompt = request["prompt"]
+        except (ValueError, KeyError, TypeError):
+            self._send({"error": "malformed request"})
+            return
+
+        try:
+            # One result behind, so the last can be marked final
+            previous: AnalysisResult | None = None
+            for analysis in stream_analysis(user_prompt, self.server.config):
+                if previous is not None:
+                    self._send({"analysis": previous.to_dict()})
+                previous = analysis
+            if previous is not None:
+                self._send({"analysis": previous.to_dict(), "final": True})
+        except PromptAnalysisError as e:
+            self._send({"error": str(e)})
+        except BrokenPipeError:
+            pass  # Client went away (e.g. Ctrl+C)
+
+
+class _AnalysisServer(socketserver.ThreadingUnixStreamServer):
+    daemon_threads = True
+
+    def __init__(self, path: Path, config: "GeminiConfig") -> None:
+        self.config = config
+        super().__init__(str(path), _AnalysisHandler)
+
+
+def create_server() -> _AnalysisServer:
+    """Create the daemon's server, bound to its socket.
+
+    Returns:
+        Server ready for ``serve``.
+
+    Raises:
+        KeyError: If API key not found in environment.
+        RuntimeError: If a daemon is already running, or the socket's
+            location isn't private to this user.
+    """
+    from choptimize.api import create_gemini_config
+
+    path = get_socket_path()
+    try:
+        path.parent.mkdir(mode=0o700, exist_ok=True)
+    except OSError as e:
+        raise RuntimeError(f"can't create {path.parent}: {e.strerror}") from e
+    if not _is_private(path.parent):
+        raise RuntimeError(f"{path.parent} is accessible by other users")
+
+    if (sock := connect()) is not None:
+        sock.close()
+        raise RuntimeError(f"daemon already running on {path}")
+    try:
+        path.unlink(missing_ok=True)  # Left behind by a daemon that died
+    except OSError as e:
+        raise RuntimeError(f"can't remove stale socket {path}: {e.strerror}") from e
+
+    config = create_gemini_config()
+    old_umask = os.umask(0o177)  # Socket is only accessible by this user
+    try:
+        return _AnalysisServer(path, config)
+    finally:
+        os.umask(old_umask)
+
+
+def serve(server: _AnalysisServer) -> None:
+    """Serve analysis requests until interrupted.
+
+    Args:
+        server: Server from ``create_server``
+    """
+    try:
+        with server:
+            server.serve_forever()
+    finally:
+        Path(server.server_address).unlink(missing_ok=True)
@@ -2,6 +2,18 @@
 
 from choptimize.display.arg_parser import ArgParser
 from choptimize.display.handles import cout
-from choptimize.display.output import display_analysis, echo, echo_err
+from choptimize.display.output import (
+    display_analysis,
+    display_batch_results,
+    echo,
+    echo_err,
+)
 
-__all__ = ["display_analysis", "echo_err", "ArgParser", "echo", "cout"]
+__all__ = [
+    "display_analysis",
+    "display_batch_results",
+    "echo_err",
+    "ArgParser",
+    "echo",
+    "cout",
+]
@@ -1,16 +1,33 @@
+import functools
 import sys
 from argparse import ArgumentParser
 from typing import NoReturn, override
 
+from rich.text import Text
+
 from choptimize.display.handles import cerr
 
 
 class ArgParser(ArgumentParser):
-    def rich_print_err(self, message: str) -> None:
+    # Fixed per parser, so built once instead of parsed as markup per message
+    @functools.cached_property
+    def _error_prefix(self) -> Text:
+        return Text(f"{self.prog}: error: ", style="bold red")
+
+    @functools.cached_property
+    def _warning_prefix(self) -> Text:
+        return Text(f"{self.prog}: warning: ", style="bold yellow")
+
+    def rich_print_err(self, message: str | Text) -> None:
         cerr.print(message)
 
+    def _prefixed(self, prefix: Text, message: str) -> Text:
+        text = prefix.copy()
+        text.append_text(Text.from_markup(message))
+        return text
+
     def _warning(self, message: str) -> None:
-        self.rich_print_err(f"[bold yellow]{self.prog}: warning:[/bold red] {message}")
+        self.rich_print_err(self._prefixed(self._warning_prefix, message))
 
     @override
     def exit(self, status: int = 0, message: str | None = None) -> NoReturn:
@@ -20,6 +37,6 @@ class ArgParser(ArgumentParser):
 
     @override
     def error(self, message: str) -> NoReturn:
-        self.rich_print_err(f"[bold red]{self.prog}: error:[/bold red] {message}")
+        self.rich_print_err(self._prefixed(self._error_prefix, message))
         self.print_usage()
         sys.exit(0)
@@ -3,21 +3,32 @@
 This module provides rich formatting for analysis results.
 """
 
+import functools
+import json
+import re
 import sys
-from typing import Any, Unpack
-
-from rich.console import Group
-from rich.markup import escape
-from rich.padding import Padding
-from rich.panel import Panel
-from rich.rule import Rule
-from rich.table import Table
+from collections.abc import Iterable, Sequence
+from typing import TYPE_CHECKING, Any, Unpack
+
+from rich.console import Group, RenderableType
 from rich.text import Text
 
 from choptimize.display.handles import cerr, cout
 from choptimize.display.theme import ICONS
 from choptimize.display.types import EchoKwargs
-from choptimize.types import AnalysisResult, get_score_assessment
+from choptimize.types import (
+    METRIC_FIELDS,
+    SCORE_ASSESSMENTS,
+    AnalysisResult,
+    Metric,
+    get_score_bucket,
+)
+
+if TYPE_CHECKING:
+    # Renderables below are imported where used, so `--help`, `--version` &
+    # error paths don't pay for them
+    from rich.rule import Rule
+    from rich.table import Table
 
 
 def echo(*objects: Any, **kwargs: Unpack[EchoKwargs]) -> None:
@@ -74,27 +85,24 @@ def _get_display_width() -> int:
         return terminal_width - 4
 
 
-def _get_score_style(score: float) -> str:
-    """Get rich theme style for a score.
+# Theme style for each score bucket (see ``get_score_bucket``)
+_SCORE_STYLES = (
+    "score.very_poor",
+    "score.poor",
+    "score.fair",
+    "score.good",
+    "score.excellent",
+)
 
-    Args:
-        score: Score value (1-10)
 
-    Returns:
-        Rich theme style name.
-    """
-    if score >= 9:
-        return "score.excellent"
-    if score >= 7:
-        return "score.good"
-    if score >= 5:
-        return "score.fair"
-    if score >= 3:
-        return "score.poor"
-    return "score.very_poor"
-
-
-def _create_section_header(title: str, icon: str | None = None) -> Rule:
+@functools.lru_cache(maxsize=64)
+def _section_title(title: str, icon: str | None = None) -> Text:
+    """Get (shared, don't mutate) section title."""
+    # A Text title (styled as Rule styles str ones) skips markup parsing per render
+    return Text(f"{icon} {title}" if icon else title, style="rule.text")
+
+
+def _create_section_header(title: str, icon: str | None = None) -> "Rule":
     """Create a consistent section header with horizontal rule.
 
     Args:
@@ -104,12 +112,66 @@ def _create_section_header(title: str, icon: str | None = None) -> Rule:
     Returns:
         Rich Rule object.
     """
-    text = f"{icon} {title}" if icon else title
+    from rich.rule import Rule
+
+    # Rule truncates its title in place to fit the width, so each gets a copy
+    text = _section_title(title, icon).copy()
     return Rule(text, style="heading.primary", align="left")
 
 
+# Tags Rich would interpret (same shape as ``rich.markup.RE_TAGS``)
+_TAG_RE = re.compile(r"(\\*)\[([a-z#/@][^[]*?)]")
+
+# Style names Gemini is instructed to use, plus the app theme's
+_STYLE_WORD = (
+    r"(?:bold|italic|underline|dim|cyan|green|yellow|red|magenta|blue|white"
+    r"|label|value|emphasis|(?:score|status|heading|border|table)\.[a-z_]+)"
+)
+_STYLE_RE = re.compile(rf"{_STYLE_WORD}(?: {_STYLE_WORD})*")
+
+
+def _escape_invalid_markup(text: str) -> str:
+    """Escape tags Rich would misrender, keeping the valid markup around them.
+
+    Unknown tags (e.g. ``list[int]``) & closing tags without a matching open
+    tag are escaped so they're shown as-is instead of swallowed or raising.
+
+    Args:
+        text: Text potentially containing rich markup
+
+    Returns:
+        Markup that ``Text.from_markup`` will render as intended.
+    """
+    open_tags: list[str] = []
+
+    def escape_if_invalid(match: re.Match[str]) -> str:
+        backslashes, tag = match.groups()
+        if len(backslashes) % 2:
+            return match[0]  # Already escaped, rendered literally
+
+        if tag == "/":
+            valid = bool(open_tags)
+            if valid:
+                open_tags.pop()
+        elif tag.startswith("/"):
+            valid = tag[1:] in open_tags
+            if valid:
+                del open_tags[len(open_tags) - 1 - open_tags[::-1].index(tag[1:])]
+        else:
+            valid = _STYLE_RE.fullmatch(tag) is not None
+            if valid:
+                open_tags.append(tag)
+
+        return match[0] if valid else f"{backslashes}\\[{tag}]"
+
+    return _TAG_RE.sub(escape_if_invalid, text)
+
+
 def _safe_render_markup(text: str) -> Text:
-    """Safely render text with markup, falling back to escaped text on error.
+    """Render text with markup, showing any invalid tags as-is.
+
+    Markup is checked up front (rather than catching parser errors), which
+    also keeps unknown tags such as ``list[int]`` from being swallowed.
 
     Args:
         text: Text potentially containing rich markup
@@ -117,34 +179,45 @@ def _safe_render_markup(text: str) -> Text:
     Returns:
         Rich Text object.
     """
-    try:
-        return Text.from_markup(text)
-    except Exception:
-        # If markup parsing fails, escape and display as-is
-        return Text(escape(text))
+    return Text.from_markup(_escape_invalid_markup(text))
+
+
+_OVERALL_SCORE_LABEL = Text("Overall Score: ", style="label")
 
 
+@functools.lru_cache(maxsize=64)
 def _create_overall_score_display(score: float) -> Text:
     """Create formatted overall score display.
 
+    The score is fixed once it arrives, so live re-renders share one Text
+    (don't mutate it).
+
     Args:
         score: Overall score (1-10)
 
     Returns:
         Rich Text object.
     """
-    style = _get_score_style(score)
-    assessment = get_score_assessment(score)
+    bucket = get_score_bucket(score)
 
-    text = Text()
-    text.append("Overall Score: ", style="label")
-    text.append(f"{score}/10", style=style)
-    text.append(f" • {assessment}", style="value")
+    text = _OVERALL_SCORE_LABEL.copy()
+    text.append(f"{score}/10", style=_SCORE_STYLES[bucket])
+    text.append(f" • {SCORE_ASSESSMENTS[bucket]}", style="value")
 
     return text
 
 
-def _create_metrics_table(analysis: AnalysisResult, width: int) -> Table:
+# (Row label, AnalysisResult field) for each metric, in display order
+_METRIC_ROWS = tuple((field.title(), field) for field in METRIC_FIELDS)
+
+
+@functools.lru_cache(maxsize=64)
+def _score_cells(metric: Metric) -> tuple[Text, str]:
+    """Get (shared, don't mutate) score & assessment cells for a metric."""
+    return Text(f"{metric.score}/10", style=_SCORE_STYLES[metric.bucket]), metric.assessment
+
+
+def _create_metrics_table(analysis: AnalysisResult, width: int) -> "Table":
     """Create the quality metrics table.
 
     Args:
@@ -154,7 +227,13 @@ def _create_metrics_table(analysis: AnalysisResult, width: int) -> Table:
     Returns:
         Rich Table object.
     """
+    from rich.table import Column, Table
+
+    # Columns collect their table's cells, so they're built fresh per table
     table = Table(
+        Column("Metric", style="label", no_wrap=True),
+        Column("Score", justify="center", style="value"),
+        Column("Assessment", style="value"),
         show_header=True,
         header_style="table.header",
         border_style="border.accent",
@@ -164,113 +243,194 @@ def _create_metrics_table(analysis: AnalysisResult, width: int) -> Table:
         pad_edge=False,
     )
 
-    table.add_column("Metric", style="label", no_wrap=True)
-    table.add_column("Score", justify="center", style="value")
-    table.add_column("Assessment", style="value")
-
-    metrics = [
-        ("Specificity", analysis.specificity),
-        ("Clarity", analysis.clarity),
-        ("Context", analysis.context),
-        ("Constraints", analysis.constraints),
-        ("Brevity", analysis.brevity),
+    rows = [
+        (metric_name, *_score_cells(metric))
+        for metric_name, field in _METRIC_ROWS
+        if (metric := getattr(analysis, field)) is not None
     ]
 
-    for metric_name, metric in metrics:
-        score_style = _get_score_style(metric.score)
-        score_text = Text(f"{metric.score}/10", style=score_style)
-        assessment = get_score_assessment(metric.score)
-        table.add_row(metric_name, score_text, assessment)
+    for row in rows:
+        table.add_row(*row)
 
     return table
 
 
-def _create_recommendations_list(recommendations: list[str]) -> Group:
+@functools.lru_cache(maxsize=64)
+def _prefix_for_index(i: int) -> Text:
+    """Get (shared, don't mutate) numbered list prefix for item ``i``."""
+    return Text.assemble("  ", (f"{i}.", "label"), " ")
+
+
+_NEWLINE = Text("\n")
+
+
+def _create_recommendations_list(recommendations: list[str]) -> Text:
     """Create formatted recommendations list.
 
     Args:
         recommendations: List of recommendation strings
 
     Returns:
-        Rich Group object.
+        Rich Text object (one line per recommendation).
     """
     items = []
     for i, rec in enumerate(recommendations, 1):
         # Render recommendation with markup enabled
-        items.append(_safe_render_markup(f"  [label]{i}.[/label] {rec}"))
+        item = _prefix_for_index(i).copy()
+        item.append_text(_safe_render_markup(rec))
+        items.append(item)
 
-    return Group(*items)
+    # One Text rather than a Group of them: a single renderable to lay out
+    return _NEWLINE.join(items)
 
 
-def display_analysis(analysis: AnalysisResult, user_prompt: str) -> None:
-    """Display complete analysis with improved formatting.
+# Spacer between sections; a plain str would be re-parsed as markup every frame
+_BLANK_LINE = Text()
 
-    Args:
-        analysis: Analysis results from Gemini
-        user_prompt: Original user prompt that was analyzed
-    """
-    width = _get_display_width()
+
+def _create_prompt_section(user_prompt: str, width: int) -> list[RenderableType]:
+    from rich.panel import Panel
 
     # Section 1: Your Prompt
-    echo(_create_section_header("Your Prompt", ICONS["prompt"]))
-    echo(Panel(
-        user_prompt,
-        border_style="border.default",
-        width=width,
-        padding=(0, 1),
-    ))
-    echo()
+    return [
+        _create_section_header("Your Prompt", ICONS["prompt"]),
+        Panel(
+            Text(user_prompt),  # Literal: brackets in prompts aren't markup
+            border_style="border.default",
+            width=width,
+            padding=(0, 1),
+        ),
+        _BLANK_LINE,
+    ]
 
-    # Section 2: Quality Analysis (Score + Metrics Table)
-    echo(_create_section_header("Quality Analysis", ICONS["analysis"]))
 
-    # Create grouped content: score + table
-    score_display = _create_overall_score_display(analysis.overall_score)
-    metrics_table = _create_metrics_table(analysis, width - 4)  # Account for panel padding
+def _render_analysis(
+    analysis: AnalysisResult,
+    prompt_section: list[RenderableType],
+    width: int,
+) -> Group:
+    """Render (possibly partial) analysis as a single renderable.
 
-    analysis_group = Group(
-        Padding(score_display, (1, 0, 1, 0)),  # Top/bottom padding around score
-        metrics_table,
-        Padding("", (1, 0, 0, 0)),  # Bottom padding
-    )
+    Sections whose data hasn't arrived yet are omitted.
 
-    echo(Panel(
-        analysis_group,
-        border_style="border.accent",
-        width=width,
-        padding=(0, 1),
-    ))
-    echo()
+    Args:
+        analysis: Analysis results from Gemini
+        prompt_section: Pre-built "Your Prompt" section (unchanged across updates)
+        width: Display width
+
+    Returns:
+        Rich Group object.
+    """
+    from rich.padding import Padding
+    from rich.panel import Panel
+
+    sections = list(prompt_section)
+
+    # Section 2: Quality Analysis (Score + Metrics Table)
+    if analysis.overall_score is not None:
+        sections.append(_create_section_header("Quality Analysis", ICONS["analysis"]))
+
+        # Create grouped content: score + table
+        score_display = _create_overall_score_display(analysis.overall_score)
+        metrics_table = _create_metrics_table(analysis, width - 4)  # Account for panel padding
+
+        analysis_group = Group(
+            Padding(score_display, (1, 0, 1, 0)),  # Top/bottom padding around score
+            metrics_table,
+            Padding(_BLANK_LINE, (1, 0, 0, 0)),  # Bottom padding
+        )
+
+        sections.append(Panel(
+            analysis_group,
+            border_style="border.accent",
+            width=width,
+            padding=(0, 1),
+        ))
+        sections.append(_BLANK_LINE)
 
     # Section 3: Detailed Assessment
-    echo(_create_section_header("Detailed Assessment", ICONS["assessment"]))
-    echo(Panel(
-        _safe_render_markup(analysis.overall_assessment),  # Enable markup rendering
-        border_style="border.default",
-        width=width,
-        padding=(0, 1),
-    ))
-    echo()
+    if analysis.overall_assessment:
+        sections.append(_create_section_header("Detailed Assessment", ICONS["assessment"]))
+        sections.append(Panel(
+            _safe_render_markup(analysis.overall_assessment),  # Enable markup rendering
+            border_style="border.default",
+            width=width,
+            padding=(0, 1),
+        ))
+        sections.append(_BLANK_LINE)
 
     # Section 4: Recommendations
     if analysis.recommendations:
-        echo(_create_section_header("Recommendations", ICONS["recommendations"]))
+        sections.append(_create_section_header("Recommendations", ICONS["recommendations"]))
         recommendations_display = _create_recommendations_list(analysis.recommendations)
-        echo(Panel(
+        sections.append(Panel(
             recommendations_display,
             border_style="border.default",
             width=width,
             padding=(0, 1),
         ))
-        echo()
+        sections.append(_BLANK_LINE)
 
     # Section 5: Improved Prompt
     if analysis.improved_prompt:
-        echo(_create_section_header("Improved Prompt", ICONS["improved"]))
-        echo(Panel(
+        sections.append(_create_section_header("Improved Prompt", ICONS["improved"]))
+        sections.append(Panel(
             _safe_render_markup(analysis.improved_prompt),  # Enable markup rendering
             border_style="border.success",
             width=width,
             padding=(0, 1),
         ))
-        echo()
+        sections.append(_BLANK_LINE)
+
+    return Group(*sections)
+
+
+def display_analysis(analyses: Iterable[AnalysisResult], user_prompt: str) -> None:
+    """Display analysis with improved formatting, updating it as it streams in.
+
+    Args:
+        analyses: Successive (partial) analysis results from Gemini; the last
+            one is the complete analysis
+        user_prompt: Original user prompt that was analyzed
+    """
+    # Nothing below depends on the streamed data, so compute it once
+    width = _get_display_width()
+    prompt_section = _create_prompt_section(user_prompt, width)
+
+    if not cout.is_terminal:
+        # Interim frames are never shown when piped, so don't build them;
+        # the final frame goes out in a single print
+        analysis: AnalysisResult | None = None
+        for analysis in analyses:
+            pass
+        if analysis is not None:
+            cout.print(_render_analysis(analysis, prompt_section, width))
+        return
+
+    from rich.live import Live
+
+    # Updates only swap the renderable; redraws are throttled to the refresh
+    # rate, so a burst of small chunks costs one terminal write
+    with Live(console=cout, refresh_per_second=10) as live:
+        for analysis in analyses:
+            live.update(_render_analysis(analysis, prompt_section, width))
+
+
+def display_batch_results(
+    user_prompts: Sequence[str],
+    results: Sequence[AnalysisResult | Exception],
+) -> None:
+    """Write batch analysis results to stdout as JSON Lines.
+
+    Args:
+        user_prompts: Prompts that were analyzed
+        results: Analysis (or error) for each prompt, in the same order
+    """
+    for user_prompt, result in zip(user_prompts, results):
+        record: dict[str, Any] = {"prompt": user_prompt}
+        if isinstance(result, Exception):
+            record["error"] = _safe_render_markup(str(result)).plain
+        else:
+            record["analysis"] = result.to_dict()  # Same format as Gemini's response
+        sys.stdout.write(json.dumps(record) + "\n")
+    sys.stdout.flush()
@@ -3,45 +3,49 @@
 Defines semantic color scheme and UI elements following accessibility best practices.
 """
 
+from types import MappingProxyType
+
+from rich.style import Style
 from rich.theme import Theme
 
 # Application color theme (WCAG 2.1 compliant, colorblind-safe)
+# Styles are built directly, skipping style-string parsing at import
 APP_THEME = Theme({
     # Headings
-    "heading.primary": "bold bright_blue",
-    "heading.secondary": "bold cyan",
+    "heading.primary": Style(color="bright_blue", bold=True),
+    "heading.secondary": Style(color="cyan", bold=True),
 
     # Status indicators
-    "status.info": "bright_cyan",
-    "status.success": "bright_green",
-    "status.warning": "bright_yellow",
-    "status.error": "bright_red",
+    "status.info": Style(color="bright_cyan"),
+    "status.success": Style(color="bright_green"),
+    "status.warning": Style(color="bright_yellow"),
+    "status.error": Style(color="bright_red"),
 
     # Metric scores
-    "score.excellent": "bold bright_green",   # 9-10
-    "score.good": "bold green",               # 7-8
-    "score.fair": "bold bright_yellow",       # 5-6
-    "score.poor": "bold yellow",              # 3-4
-    "score.very_poor": "bold bright_red",     # 1-2
+    "score.excellent": Style(color="bright_green", bold=True),   # 9-10
+    "score.good": Style(color="green", bold=True),               # 7-8
+    "score.fair": Style(color="bright_yellow", bold=True),       # 5-6
+    "score.poor": Style(color="yellow", bold=True),              # 3-4
+    "score.very_poor": Style(color="bright_red", bold=True),     # 1-2
 
     # UI elements
-    "border.default": "bright_black",
-    "border.accent": "bright_blue",
-    "border.success": "bright_green",
-    "label": "cyan",
-    "value": "white",
-    "emphasis": "bold",
+    "border.default": Style(color="bright_black"),
+    "border.accent": Style(color="bright_blue"),
+    "border.success": Style(color="bright_green"),
+    "label": Style(color="cyan"),
+    "value": Style(color="white"),
+    "emphasis": Style(bold=True),
 
     # Table styles
-    "table.header": "bold bright_blue",
-    "table.row": "white",
+    "table.header": Style(color="bright_blue", bold=True),
+    "table.row": Style(color="white"),
 })
 
 # Section icons for visual scanning
-ICONS = {
+ICONS = MappingProxyType({
     "prompt": "📝",
     "analysis": "📊",
     "assessment": "💭",
     "recommendations": "💡",
     "improved": "✨",
-}
+})
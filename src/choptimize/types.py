@@ -3,46 +3,53 @@
 Central location for all dataclasses and type definitions used throughout the app.
 """
 
-from dataclasses import dataclass
-from typing import Any
+import bisect
+from dataclasses import dataclass, field
+from typing import TYPE_CHECKING, Any
 
-from google import genai
+if TYPE_CHECKING:
+    # Only needed for annotations; importing it costs hundreds of ms at startup
+    from google import genai
 
+DEFAULT_MODEL = "gemini-2.5-flash"
+FAST_MODEL = "gemini-2.5-flash-lite"  # Tried first; see ``analysis.analyzer``
 
-@dataclass(frozen=True)
+
+@dataclass(frozen=True, slots=True)
 class GeminiConfig:
     """Configuration for Gemini API client."""
 
-    client: genai.Client
-    model_name: str = "gemini-2.5-flash"
+    client: "genai.Client"
+    model_name: str = DEFAULT_MODEL
+
 
+# AnalysisResult's Metric fields (also the keys of Gemini's "metrics" object)
+METRIC_FIELDS = ("specificity", "clarity", "context", "constraints", "brevity")
 
-@dataclass(frozen=True)
+
+@dataclass(frozen=True, slots=True)
 class Metric:
-    """Analysis metric with score only."""
+    """Analysis metric with score (plus its bucket & assessment label)."""
 
     score: float
+    # Derived from score once here rather than on every render
+    bucket: int = field(init=False, compare=False)
+    assessment: str = field(init=False, compare=False)
 
-    @classmethod
-    def from_dict(cls, data: dict[str, Any]) -> "Metric":
-        """Create Metric from dictionary.
-
-        Args:
-            data: Dictionary with 'score' key.
+    def __post_init__(self) -> None:
+        bucket = get_score_bucket(self.score)
+        object.__setattr__(self, "bucket", bucket)
+        object.__setattr__(self, "assessment", SCORE_ASSESSMENTS[bucket])
 
-        Returns:
-            Metric instance.
 
-        Raises:
-            ValueError: If score is missing.
-        """
-        try:
-            return cls(score=float(data["score"]))
-        except (KeyError, ValueError, TypeError) as e:
-            raise ValueError(f"Invalid metric data: {e}") from e
+def _as_score(value: Any) -> float | None:
+    # Bool is an int subclass, but never a score
+    if isinstance(value, int | float) and not isinstance(value, bool):
+        return float(value)
+    return None
 
 
-@dataclass(frozen=True)
+@dataclass(frozen=True, slots=True)
 class AnalysisResult:
     """Complete analysis result for a coding prompt."""
 
@@ -59,63 +66,91 @@ class AnalysisResult:
     validation_reason: str | None = None
 
     @classmethod
-    def from_dict(cls, data: dict[str, Any]) -> "AnalysisResult":
-        """Create AnalysisResult from Gemini API response.
+    def from_partial_dict(cls, data: dict[str, Any]) -> "AnalysisResult":
+        """Create AnalysisResult from an incomplete (still streaming) response.
 
-        Handles both validation-only responses and full analysis responses.
+        Fields that haven't arrived yet (or are still malformed) are None.
 
         Args:
-            data: Dictionary with analysis data from Gemini.
+            data: Partial dictionary with analysis data from Gemini.
 
         Returns:
             AnalysisResult instance.
+        """
+        metrics = data.get("metrics")
+        if not isinstance(metrics, dict):
+            metrics = {}
+
+        # Runs on every streamed chunk, so missing fields are checked for
+        # rather than raised & caught
+        def metric(name: str) -> Metric | None:
+            metric_data = metrics.get(name)
+            if not isinstance(metric_data, dict):
+                return None
+            score = _as_score(metric_data.get("score"))
+            return None if score is None else Metric(score=score)
+
+        overall_score = _as_score(data.get("overall_score"))
+
+        assessment = data.get("overall_assessment")
+        recommendations = data.get("recommendations")
+        improved_prompt = data.get("improved_prompt")
+        reason = data.get("reason")
+
+        return cls(
+            is_coding_related=data.get("is_coding_related", True) is not False,
+            overall_score=overall_score,
+            overall_assessment=assessment if isinstance(assessment, str) else None,
+            **{name: metric(name) for name in METRIC_FIELDS},
+            recommendations=(
+                [rec for rec in recommendations if isinstance(rec, str)]
+                if isinstance(recommendations, list)
+                else None
+            ),
+            improved_prompt=improved_prompt if isinstance(improved_prompt, str) else None,
+            validation_reason=reason if isinstance(reason, str) else None,
+        )
+
+    def to_dict(self) -> dict[str, Any]:
+        """Convert to dictionary in the Gemini response format.
+
+        Inverse of ``from_partial_dict``.
 
-        Raises:
-            ValueError: If the data structure is invalid.
+        Returns:
+            Dictionary with analysis data.
         """
-        is_coding_related = data.get("is_coding_related", True)
-
-        if not is_coding_related:
-            # Validation failed - minimal response
-            return cls(
-                is_coding_related=False,
-                validation_reason=data.get("reason", "Not a coding prompt"),
-            )
-
-        # Full analysis response
-        try:
-            metrics = data["metrics"]
-            return cls(
-                is_coding_related=True,
-                overall_score=float(data["overall_score"]),
-                overall_assessment=str(data["overall_assessment"]),
-                specificity=Metric.from_dict(metrics["specificity"]),
-                clarity=Metric.from_dict(metrics["clarity"]),
-                context=Metric.from_dict(metrics["context"]),
-                constraints=Metric.from_dict(metrics["constraints"]),
-                brevity=Metric.from_dict(metrics["brevity"]),
-                recommendations=list(data.get("recommendations", [])),
-                improved_prompt=data.get("improved_prompt"),
-            )
-        except (KeyError, ValueError, TypeError) as e:
-            raise ValueError(f"Invalid analysis data: {e}") from e
-
-
-def get_score_assessment(score: float) -> str:
-    """Get text assessment for a score.
+        if not self.is_coding_related:
+            return {"is_coding_related": False, "reason": self.validation_reason}
+
+        metrics = {
+            name: {"score": metric.score}
+            for name in METRIC_FIELDS
+            if (metric := getattr(self, name)) is not None
+        }
+        data = {
+            "is_coding_related": True,
+            "overall_score": self.overall_score,
+            "overall_assessment": self.overall_assessment,
+            "metrics": metrics,
+            "recommendations": self.recommendations,
+            "improved_prompt": self.improved_prompt,
+        }
+        return {key: value for key, value in data.items() if value is not None}
+
+
+# Lower bounds of score buckets (1-2, 3-4, 5-6, 7-8, 9-10)
+SCORE_THRESHOLDS = (3, 5, 7, 9)
+SCORE_ASSESSMENTS = ("Poor", "Needs improvement", "Fair", "Good", "Excellent")
+
+
+def get_score_bucket(score: float) -> int:
+    """Get bucket index for a score.
 
     Args:
         score: The score value (1-10).
 
     Returns:
-        A text assessment label.
+        Index into per-bucket tables, e.g. ``SCORE_ASSESSMENTS``.
     """
-    if score >= 9:
-        return "Excellent"
-    if score >= 7:
-        return "Good"
-    if score >= 5:
-        return "Fair"
-    if score >= 3:
-        return "Needs improvement"
-    return "Poor"
+    return bisect.bisect_right(SCORE_THRESHOLDS, score)
+
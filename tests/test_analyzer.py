@@ -0,0 +1,171 @@
+import asyncio
+import json
+from collections.abc import Iterator
+from pathlib import Path
+from typing import Any
+
+import pytest
+
+from choptimize.analysis import analyzer
+from choptimize.analysis.cache import DiskCache
+from choptimize.api.partial_json import parse_partial_json
+from choptimize.types import DEFAULT_MODEL, FAST_MODEL, METRIC_FIELDS, GeminiConfig
+
+PROMPT = "write a csv parser please"
+
+
+def _response(model: str, score: float | None) -> str:
+    # A rejection if score is None
+    if score is None:
+        return json.dumps({"is_coding_related": False, "reason": f"{model} says no"})
+    return json.dumps(
+        {
+            "is_coding_related": True,
+            "overall_score": score,
+            "overall_assessment": f"assessed by {model}",
+            "metrics": {name: {"score": score} for name in METRIC_FIELDS},
+            "recommendations": [
+                f"{model} rec {i}" for i in range(3 if model == FAST_MODEL else 1)
+            ],
+            "improved_prompt": f"improved by {model}",
+        }
+    )
+
+
+class FakeGemini:
+    """Stands in for ``analyzer.client``'s API calls, recording each one."""
+
+    def __init__(self, scores: dict[str, float | None]) -> None:
+        self.scores = scores
+        self.calls: list[str] = []
+        self.prompts: list[str] = []
+
+    def stream_analysis(
+        self, config: GeminiConfig, prompt_text: str
+    ) -> Iterator[tuple[dict[str, Any] | None, str]]:
+        self.calls.append(config.model_name)
+        text = _response(config.model_name, self.scores[config.model_name])
+        for end in range(20, len(text) + 20, 20):
+            yield parse_partial_json(text[:end]), text[:end]
+
+    async def a_analyze_prompt(self, config: GeminiConfig, prompt_text: str) -> str:
+        self.calls.append(config.model_name)
+        self.prompts.append(prompt_text)
+        # "bake ..." prompts are rejected by every model
+        rejected = prompt_text.startswith("bake")
+        score = None if rejected else self.scores[config.model_name]
+        return _response(config.model_name, score)
+
+
+@pytest.fixture
+def gemini(tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> FakeGemini:
+    fake = FakeGemini({FAST_MODEL: 9.0, DEFAULT_MODEL: 7.0})
+    monkeypatch.setattr(analyzer, "_cache", DiskCache(tmp_path))
+    config = GeminiConfig(client=None)
+    monkeypatch.setattr(analyzer.client, "create_gemini_config", lambda: config)
+    monkeypatch.setattr(analyzer.client, "stream_analysis", fake.stream_analysis)
+    monkeypatch.setattr(analyzer.client, "a_analyze_prompt", fake.a_analyze_prompt)
+    return fake
+
+
+@pytest.mark.parametrize("fast_score", [2.0, 4.9, 8.1, 10.0])
+def test_fast_answer_outside_band_is_final(
+    gemini: FakeGemini, fast_score: float
+) -> None:
+    gemini.scores[FAST_MODEL] = fast_score
+    results = list(analyzer.stream_analysis(PROMPT))
+    assert gemini.calls == [FAST_MODEL]
+    assert results[-1].overall_score == fast_score
+
+
+@pytest.mark.parametrize("fast_score", [5.0, 6.5, 8.0, None])
+def test_borderline_or_rejected_fast_answer_escalates(
+    gemini: FakeGemini, fast_score: float | None
+) -> None:
+    gemini.scores[FAST_MODEL] = fast_score
+    results = list(analyzer.stream_analysis(PROMPT))
+    assert gemini.calls == [FAST_MODEL, DEFAULT_MODEL]
+    assert results[-1].overall_assessment == f"assessed by {DEFAULT_MODEL}"
+
+
+def test_escalated_result_replaces_fast_one(gemini: FakeGemini) -> None:
+    gemini.scores[FAST_MODEL] = 6.0
+    results = list(analyzer.stream_analysis(PROMPT))
+
+    fast_done = next(
+        i
+        for i, result in enumerate(results)
+        if result.improved_prompt == f"improved by {FAST_MODEL}"
+    )
+    # Once the fast answer is complete, nothing blanks it while Flash streams
+    for result in results[fast_done:]:
+        assert result.overall_score is not None
+        assert result.improved_prompt is not None
+
+    final = results[-1]
+    assert final == analyzer._from_cache(PROMPT, DEFAULT_MODEL)
+    assert final.overall_score == 7.0
+    assert final.recommendations == [f"{DEFAULT_MODEL} rec 0"]
+    assert final.improved_prompt == f"improved by {DEFAULT_MODEL}"
+
+
+def test_cached_fast_answer_only_escalates(gemini: FakeGemini) -> None:
+    gemini.scores[FAST_MODEL] = 6.0
+    list(analyzer.stream_analysis(PROMPT))
+    analyzer._cache.directory.joinpath(
+        f"{analyzer.make_key(PROMPT, DEFAULT_MODEL)}.json"
+    ).unlink()
+    gemini.calls.clear()
+
+    results = list(analyzer.stream_analysis(PROMPT))
+    assert gemini.calls == [DEFAULT_MODEL]
+    assert results[-1].overall_assessment == f"assessed by {DEFAULT_MODEL}"
+
+
+@pytest.mark.parametrize("fast_score", [9.0, 6.0])
+def test_second_run_is_served_from_cache(
+    gemini: FakeGemini, fast_score: float
+) -> None:
+    gemini.scores[FAST_MODEL] = fast_score
+    first = list(analyzer.stream_analysis(PROMPT))
+    gemini.calls.clear()
+
+    assert list(analyzer.stream_analysis(PROMPT)) == [first[-1]]
+    assert gemini.calls == []
+
+
+def test_rejection_after_escalation_raises(gemini: FakeGemini) -> None:
+    gemini.scores = {FAST_MODEL: None, DEFAULT_MODEL: None}
+    with pytest.raises(analyzer.PromptAnalysisError, match=f"{DEFAULT_MODEL} says no"):
+        list(analyzer.stream_analysis(PROMPT))
+    assert gemini.calls == [FAST_MODEL, DEFAULT_MODEL]
+
+
+@pytest.mark.parametrize(
+    ("fast_score", "calls"),
+    [(9.0, [FAST_MODEL]), (6.0, [FAST_MODEL, DEFAULT_MODEL])],
+)
+def test_batch_routing(gemini: FakeGemini, fast_score: float, calls: list[str]) -> None:
+    gemini.scores[FAST_MODEL] = fast_score
+    [result] = asyncio.run(analyzer.analyze_prompts([PROMPT]))
+    assert gemini.calls == calls
+    assert result == analyzer._from_cache(PROMPT, calls[-1])
+
+    gemini.calls.clear()
+    assert asyncio.run(analyzer.analyze_prompts([PROMPT])) == [result]
+    assert gemini.calls == []
+
+
+def test_batch_duplicates_are_analyzed_once(gemini: FakeGemini) -> None:
+    rejected = "bake a sourdough loaf tonight"
+    prompts = [PROMPT, rejected, PROMPT, "fix foo.py", rejected, PROMPT]
+    results = asyncio.run(analyzer.analyze_prompts(prompts))
+
+    # Rejections escalate, so the rejected prompt is sent to both models
+    assert sorted(gemini.prompts) == sorted([PROMPT, rejected, rejected])
+    assert len(results) == len(prompts)
+    assert results[0] is results[2] is results[5]
+    assert results[0] == analyzer._from_cache(PROMPT, FAST_MODEL)
+    assert isinstance(results[1], analyzer.PromptAnalysisError)
+    assert results[1] is results[4]
+    assert results[3] == analyzer.try_local_analyze("fix foo.py")
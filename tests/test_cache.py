@@ -0,0 +1,78 @@
+import json
+import os
+import time
+from pathlib import Path
+
+import pytest
+
+from choptimize.analysis.cache import PRUNE_INTERVAL, DiskCache, make_key
+
+
+@pytest.fixture
+def cache(tmp_path: Path) -> DiskCache:
+    return DiskCache(tmp_path, ttl=60)
+
+
+def _write(cache: DiskCache, key: str, entry: object) -> Path:
+    path = cache.directory / f"{key}.json"
+    path.write_text(json.dumps(entry), encoding="utf-8")
+    return path
+
+
+def test_round_trip(cache: DiskCache) -> None:
+    assert cache.get("k") is None
+    cache.set("k", {"a": 1})
+    assert cache.get("k") == {"a": 1}
+
+
+def test_keys_depend_on_prompt_and_model() -> None:
+    assert make_key("p", "m") == make_key("p", "m")
+    assert make_key("p", "m") != make_key("p", "n")
+    assert make_key("p", "m") != make_key("q", "m")
+
+
+def test_expired_entry_is_removed(cache: DiskCache) -> None:
+    path = _write(cache, "k", {"expires": time.time() - 1, "value": {"a": 1}})
+    assert cache.get("k") is None
+    assert not path.exists()
+
+
+@pytest.mark.parametrize(
+    "entry",
+    [
+        {"expires": "tomorrow", "value": {}},
+        {"expires": None, "value": {}},
+        {"expires": [1], "value": {}},
+        {"value": {}},
+        ["not", "a", "dict"],
+    ],
+)
+def test_malformed_entry_is_a_miss(cache: DiskCache, entry: object) -> None:
+    path = _write(cache, "k", entry)
+    assert cache.get("k") is None
+    assert not path.exists()
+
+
+def test_corrupt_entry_is_a_miss(cache: DiskCache) -> None:
+    path = cache.directory / "k.json"
+    path.write_text("{not json", encoding="utf-8")
+    assert cache.get("k") is None
+    assert not path.exists()
+
+
+def test_set_prunes_expired_entries_once_per_interval(cache: DiskCache) -> None:
+    expired = _write(cache, "old", {"expires": time.time() - 1, "value": {}})
+    stale_tmp = cache.directory / "old.1.2.tmp"
+    stale_tmp.write_text("{", encoding="utf-8")
+    old = time.time() - PRUNE_INTERVAL - 1
+    os.utime(stale_tmp, (old, old))
+
+    cache.set("new", {"a": 1})
+    assert not expired.exists()
+    assert not stale_tmp.exists()
+    assert cache.get("new") == {"a": 1}
+
+    # Swept recently, so the next write doesn't scan the directory again
+    expired = _write(cache, "old", {"expires": time.time() - 1, "value": {}})
+    cache.set("newer", {"a": 2})
+    assert expired.exists()
@@ -0,0 +1,124 @@
+import json
+import socket
+import threading
+from collections.abc import Callable, Iterator
+from pathlib import Path
+
+import pytest
+
+import choptimize.analysis
+import choptimize.api
+from choptimize import daemon
+from choptimize.types import AnalysisResult, Metric
+
+RESULT = AnalysisResult(
+    is_coding_related=True,
+    overall_score=6.0,
+    overall_assessment="ok",
+    specificity=Metric(score=6.0),
+    clarity=Metric(score=6.0),
+    context=Metric(score=6.0),
+    constraints=Metric(score=6.0),
+    brevity=Metric(score=6.0),
+    recommendations=["r"],
+    improved_prompt="p",
+)
+PARTIAL = AnalysisResult(is_coding_related=True, overall_score=6.0)
+
+Reply = Callable[[list[dict]], socket.socket]
+
+
+@pytest.fixture
+def runtime_dir(tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> Path:
+    tmp_path.chmod(0o700)
+    monkeypatch.setenv("XDG_RUNTIME_DIR", str(tmp_path))
+    return tmp_path
+
+
+@pytest.fixture
+def reply() -> Iterator[Reply]:
+    # Daemon stand-in that sends `lines` then closes its end for writing
+    peers: list[socket.socket] = []
+
+    def send(lines: list[dict]) -> socket.socket:
+        client, server = socket.socketpair()
+        server.sendall(b"".join(json.dumps(line).encode() + b"\n" for line in lines))
+        server.shutdown(socket.SHUT_WR)
+        peers.append(server)
+        return client
+
+    yield send
+    for peer in peers:
+        peer.close()
+
+
+def test_partials_then_final(reply: Reply) -> None:
+    sock = reply(
+        [
+            {"analysis": PARTIAL.to_dict()},
+            {"analysis": RESULT.to_dict(), "final": True},
+            {"analysis": PARTIAL.to_dict()},  # Never read
+        ]
+    )
+    assert list(daemon.request_analysis(sock, "prompt")) == [PARTIAL, RESULT]
+
+
+def test_eof_before_final_raises(reply: Reply) -> None:
+    sock = reply([{"analysis": PARTIAL.to_dict()}])
+    analyses = daemon.request_analysis(sock, "prompt")
+    assert next(analyses) == PARTIAL
+    with pytest.raises(daemon.DaemonError):
+        next(analyses)
+
+
+def test_error_raises(reply: Reply) -> None:
+    sock = reply([{"error": "boom"}])
+    with pytest.raises(daemon.DaemonError, match="boom"):
+        list(daemon.request_analysis(sock, "prompt"))
+
+
+def test_round_trip(runtime_dir: Path, monkeypatch: pytest.MonkeyPatch) -> None:
+    def stream_analysis(user_prompt: str, config: object) -> Iterator[AnalysisResult]:
+        assert user_prompt == "prompt"
+        yield PARTIAL
+        yield RESULT
+
+    monkeypatch.setattr(choptimize.api, "create_gemini_config", lambda: None)
+    monkeypatch.setattr(choptimize.analysis, "stream_analysis", stream_analysis)
+
+    server = daemon.create_server()
+    thread = threading.Thread(target=daemon.serve, args=(server,))
+    thread.start()
+    try:
+        sock = daemon.connect()
+        assert sock is not None
+        assert list(daemon.request_analysis(sock, "prompt")) == [PARTIAL, RESULT]
+        with pytest.raises(RuntimeError, match="already running"):
+            daemon.create_server()
+    finally:
+        server.shutdown()
+        thread.join()
+    assert not (runtime_dir / "choptimize.sock").exists()
+
+
+def test_shared_directory_is_refused(runtime_dir: Path) -> None:
+    runtime_dir.chmod(0o777)
+    with pytest.raises(RuntimeError, match="other users"):
+        daemon.create_server()
+    assert daemon.connect() is None
+
+
+def test_socket_not_private_is_ignored(runtime_dir: Path) -> None:
+    path = runtime_dir / "choptimize.sock"
+    listener = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+    listener.bind(str(path))
+    listener.listen()
+    try:
+        path.chmod(0o666)
+        assert daemon.connect() is None
+        path.chmod(0o600)
+        sock = daemon.connect()
+        assert sock is not None
+        sock.close()
+    finally:
+        listener.close()
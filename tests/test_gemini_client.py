@@ -0,0 +1,57 @@
+import asyncio
+from pathlib import Path
+from types import SimpleNamespace
+
+import pytest
+
+from choptimize.api import gemini_client
+
+
+class FakeCaches:
+    def __init__(self, fail: bool = False) -> None:
+        self.fail = fail
+        self.creates: list[str] = []
+
+    async def create(self, model: str, config: object) -> SimpleNamespace:
+        self.creates.append(model)
+        await asyncio.sleep(0.01)
+        if self.fail:
+            raise RuntimeError("caching unavailable")
+        return SimpleNamespace(name=f"cachedContents/{model}", expire_time=None)
+
+
+@pytest.fixture(autouse=True)
+def cache_path(tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> None:
+    monkeypatch.setattr(gemini_client, "CONTEXT_CACHE_PATH", tmp_path / "caches.json")
+
+
+def _client(caches: FakeCaches) -> SimpleNamespace:
+    return SimpleNamespace(aio=SimpleNamespace(caches=caches))
+
+
+async def _get_concurrently(client: SimpleNamespace, model: str) -> list[str | None]:
+    return await asyncio.gather(
+        *(gemini_client._a_get_context_cache(client, model) for _ in range(5))
+    )
+
+
+def test_concurrent_requests_share_one_create() -> None:
+    caches = FakeCaches()
+    client = _client(caches)
+
+    names = asyncio.run(_get_concurrently(client, "m"))
+    assert names == ["cachedContents/m"] * 5
+    assert caches.creates == ["m"]
+
+    # Persisted, so later runs don't create it again
+    assert asyncio.run(_get_concurrently(client, "m")) == names
+    assert caches.creates == ["m"]
+
+
+def test_failed_create_is_not_retried() -> None:
+    caches = FakeCaches(fail=True)
+    client = _client(caches)
+
+    assert asyncio.run(_get_concurrently(client, "m")) == [None] * 5
+    assert asyncio.run(_get_concurrently(client, "m")) == [None] * 5
+    assert caches.creates == ["m"]
@@ -0,0 +1,46 @@
+import pytest
+
+from choptimize.analysis.heuristic import try_local_analyze
+
+
+@pytest.mark.parametrize(
+    "prompt",
+    [
+        "fix my car",
+        "class schedule tomorrow",
+        "tv program guide",
+        "query about taxes",
+        "rust removal tips",
+        "bake a cake",
+    ],
+)
+def test_everyday_words_go_to_gemini(prompt: str) -> None:
+    assert try_local_analyze(prompt) is None
+
+
+@pytest.mark.parametrize(
+    "prompt",
+    [
+        "fix python bug",
+        "debug `parse`",
+        "foo() crashes",
+        "refactor main.py",
+        "optimize sql query",
+        "c++ segfault",
+    ],
+)
+def test_clear_code_signals_are_scored_locally(prompt: str) -> None:
+    result = try_local_analyze(prompt)
+    assert result is not None
+    assert result.is_coding_related
+    assert result.overall_score == 1.6
+
+
+def test_long_prompts_go_to_gemini() -> None:
+    assert try_local_analyze("fix the python bug in my parser module") is None
+
+
+def test_prompt_is_escaped_in_improved_prompt() -> None:
+    result = try_local_analyze("fix [red]python")
+    assert result is not None
+    assert result.improved_prompt.startswith(r"fix \[red]python")
@@ -0,0 +1,29 @@
+import pytest
+
+from choptimize.display.output import _safe_render_markup
+
+
+@pytest.mark.parametrize(
+    ("markup", "plain"),
+    [
+        ("list[int] and [bold]y[/bold]", "list[int] and y"),
+        ("[red]a[/red] dict[str, int]", "a dict[str, int]"),
+        ("stray [/bold] close", "stray [/bold] close"),
+        ("[bold]a[/] [/]", "a [/]"),
+        ("[bold]a [italic]b[/bold] c[/italic]", "a b c"),
+        ("[bold]unclosed", "unclosed"),
+        (r"\[bold] literal", "[bold] literal"),
+        (r"\\[bold]x[/bold]", "\\x"),
+        (r"\\[int]", "\\[int]"),
+        ("[@click]x[/]", "[@click]x[/]"),
+    ],
+)
+def test_plain_text(markup: str, plain: str) -> None:
+    assert _safe_render_markup(markup).plain == plain
+
+
+def test_valid_markup_is_styled() -> None:
+    text = _safe_render_markup("list[int] and [bold cyan]y[/bold cyan]")
+    assert [(span.start, span.end, span.style) for span in text.spans] == [
+        (14, 15, "bold cyan")
+    ]
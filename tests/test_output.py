@@ -0,0 +1,17 @@
+from rich.console import Console
+
+from choptimize.display.output import _create_section_header
+
+
+def _render(width: int) -> str:
+    console = Console(width=width, color_system=None, legacy_windows=False)
+    with console.capture() as capture:
+        console.print(_create_section_header("Detailed Assessment", "*"))
+    return capture.get()
+
+
+def test_narrow_render_does_not_truncate_later_headers() -> None:
+    wide = _render(80)
+    assert "…" in _render(12)
+    assert _render(80) == wide
+    assert "* Detailed Assessment" in wide
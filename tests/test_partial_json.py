@@ -0,0 +1,115 @@
+import json
+from typing import Any
+
+import pytest
+
+from choptimize.api import partial_json
+from choptimize.api.partial_json import parse_partial_json
+
+RESPONSE = {
+    "is_coding_related": True,
+    "overall_score": 6.5,
+    "overall_assessment": (
+        'Asks for a "parser" but\nomits the format (e.g. CSV\\TSV) — café'
+    ),
+    "metrics": {
+        "specificity": {"score": 5},
+        "clarity": {"score": 8.25},
+        "context": {"score": 3},
+        "constraints": {"score": 10},
+        "brevity": {"score": 9},
+    },
+    "recommendations": ["[bold]State[/bold] the format", "Give an example row"],
+    "improved_prompt": "Write a Python CSV parser\tthat handles `\"quoted\"` fields",
+}
+
+
+@pytest.fixture(autouse=True, params=["orjson", "json"])
+def loads(request: pytest.FixtureRequest, monkeypatch: pytest.MonkeyPatch) -> None:
+    # Same results with or without the optional orjson speedup
+    if request.param == "json":
+        monkeypatch.setattr(partial_json, "json_loads", json.loads)
+    else:
+        pytest.importorskip("orjson")
+
+
+def _is_prefix(partial: Any, full: Any) -> bool:
+    # Whether `partial` could have been parsed from a prefix of `full`
+    if isinstance(full, dict):
+        return isinstance(partial, dict) and all(
+            key in full and _is_prefix(value, full[key])
+            for key, value in partial.items()
+        )
+    if isinstance(full, list):
+        return (
+            isinstance(partial, list)
+            and len(partial) <= len(full)
+            and all(map(_is_prefix, partial, full))
+        )
+    if isinstance(full, str):
+        return isinstance(partial, str) and full.startswith(partial)
+    return partial == full and type(partial) is type(full)
+
+
+@pytest.mark.parametrize("ensure_ascii", [True, False])
+def test_every_prefix_of_a_response(ensure_ascii: bool) -> None:
+    text = json.dumps(RESPONSE, ensure_ascii=ensure_ascii)
+    previous: dict[str, Any] = {}
+    for end in range(len(text) + 1):
+        parsed = parse_partial_json(text[:end])
+        if parsed is None:
+            assert not previous  # Once something's usable, it stays usable
+            continue
+        assert _is_prefix(parsed, RESPONSE), text[:end]
+        assert _is_prefix(previous, parsed), text[:end]
+        previous = parsed
+    assert previous == RESPONSE
+
+
+@pytest.mark.parametrize(
+    ("text", "expected"),
+    [
+        ('{"a": "x\\', {"a": "x"}),
+        ('{"a": "x\\u00', {"a": "x"}),
+        ('{"a": "x\\u00e9', {"a": "xé"}),
+        ('{"a": "say \\"hi', {"a": 'say "hi'}),
+        ('{"a": "back\\\\', {"a": "back\\"}),
+    ],
+)
+def test_escape_cut_mid_stream(text: str, expected: dict[str, Any]) -> None:
+    assert parse_partial_json(text) == expected
+
+
+@pytest.mark.parametrize(
+    ("text", "expected"),
+    [
+        ('{"a": 1', {}),
+        ('{"a": 1, "b": 12', {"a": 1}),
+        ('{"a": 1.', {}),
+        ('{"a": -', {}),
+        ('{"a": 1e', {}),
+        ('{"a": [1, 2', {"a": [1]}),
+        ('{"a": tr', {}),
+    ],
+)
+def test_number_or_literal_cut_mid_stream(text: str, expected: dict[str, Any]) -> None:
+    assert parse_partial_json(text) == expected
+
+
+@pytest.mark.parametrize(
+    ("text", "expected"),
+    [
+        ('{"ove', {}),
+        ('{"a": 1, "ove', {"a": 1}),
+        ('{"a": 1, "overall"', {"a": 1}),
+        ('{"a": 1, "overall": ', {"a": 1}),
+        ('{"a": {"b', {"a": {}}),
+    ],
+)
+def test_key_cut_mid_stream(text: str, expected: dict[str, Any]) -> None:
+    assert parse_partial_json(text) == expected
+
+
+@pytest.mark.parametrize("text", ["", "  ", "[1, 2", '"abc'])
+def test_nothing_usable(text: str) -> None:
+    assert parse_partial_json(text) is None
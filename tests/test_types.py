@@ -0,0 +1,40 @@
+import json
+
+from choptimize.analysis.criteria import AnalysisSchema, MetricsSchema
+from choptimize.types import METRIC_FIELDS, AnalysisResult
+
+RESPONSE = {
+    "is_coding_related": True,
+    "overall_score": 6.5,
+    "overall_assessment": "ok",
+    "metrics": {name: {"score": i + 1.0} for i, name in enumerate(METRIC_FIELDS)},
+    "recommendations": ["r"],
+    "improved_prompt": "p",
+}
+
+
+def test_schema_metrics_match_metric_fields() -> None:
+    assert tuple(MetricsSchema.model_fields) == METRIC_FIELDS
+
+
+def test_schema_and_partial_dict_agree() -> None:
+    result = AnalysisSchema.model_validate_json(json.dumps(RESPONSE)).to_result()
+    assert result == AnalysisResult.from_partial_dict(RESPONSE)
+    assert result.to_dict() == RESPONSE
+    assert [getattr(result, name).score for name in METRIC_FIELDS] == [1, 2, 3, 4, 5]
+
+
+def test_partial_metrics() -> None:
+    result = AnalysisResult.from_partial_dict(
+        {"metrics": {"specificity": {"score": 4}, "clarity": {"score": "7"}}}
+    )
+    assert result.specificity is not None and result.specificity.score == 4
+    assert result.clarity is None
+    assert result.brevity is None
+
+
+def test_non_coding_round_trip() -> None:
+    response = {"is_coding_related": False, "reason": "cooking"}
+    result = AnalysisSchema.model_validate_json(json.dumps(response)).to_result()
+    assert result.to_dict() == response
+    assert AnalysisResult.from_partial_dict(response) == result
@@ -0,0 +1,59 @@
+"""Check choptimize's cold-start import budget.
+
+Runs ``choptimize --version`` under ``python -X importtime`` & fails if any
+module that's only needed for analysis gets imported, or if total import
+time exceeds the budget.
+
+Usage:
+    python tools/import_time.py [budget_ms]
+"""
+
+import subprocess
+import sys
+
+DEFAULT_BUDGET_MS = 250
+
+# Only needed once we're actually calling the API
+DEFERRED_MODULES = ("google.genai", "dotenv", "choptimize.analysis", "rich.live", "rich.table")
+
+
+def main() -> int:
+    budget_ms = float(sys.argv[1]) if len(sys.argv) > 1 else DEFAULT_BUDGET_MS
+
+    proc = subprocess.run(
+        [sys.executable, "-X", "importtime", "-m", "choptimize", "--version"],
+        capture_output=True,
+        text=True,
+        check=False,
+    )
+
+    total_us = 0
+    imported: set[str] = set()
+    for line in proc.stderr.splitlines():
+        # Format: "import time: <self us> | <cumulative us> | <indented module>"
+        if not line.startswith("import time:") or "[us]" in line:
+            continue
+        _, cumulative, name = line.removeprefix("import time:").split("|")
+        module = name.strip()
+        imported.add(module)
+        if not name.startswith("  "):  # Top-level import (cumulative includes children)
+            total_us += int(cumulative)
+
+    leaked = sorted(
+        module
+        for module in imported
+        for deferred in DEFERRED_MODULES
+        if module == deferred or module.startswith(f"{deferred}.")
+    )
+    total_ms = total_us / 1000
+    print(f"total import time: {total_ms:.1f} ms (budget {budget_ms:.0f} ms)")
+
+    if leaked:
+        print(f"deferred modules imported at startup: {', '.join(leaked)}")
+    if leaked or total_ms > budget_ms:
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())